@@ -0,0 +1,79 @@
+import importlib
+import threading
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List
+
+
+class LazyAgent:
+    """Stand-in for a registry agent that is only built when first used
+
+    Agents hold references to each other (master <-> memory, elderly...);
+    handing them a LazyAgent instead of the instance lets that wiring happen
+    without constructing the other agent up front.
+    """
+
+    def __init__(self, registry: "AgentRegistry", name: str):
+        self._registry = registry
+        self._name = name
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._registry[self._name], attribute)
+
+    def __repr__(self) -> str:
+        return f"<LazyAgent {self._name!r}>"
+
+
+class AgentRegistry(Mapping):
+    """Mapping of agent name to agent, importing and constructing each on first access
+
+    specs maps a name to "module:ClassName"; every agent is constructed with
+    the registry's args and kwargs. Hooks registered with add_hook run once per
+    agent, right after it is built, to wire it to the others. Membership tests
+    and iteration only look at the specs and never build anything.
+    """
+
+    def __init__(self, specs: Dict[str, str], *args: Any, **kwargs: Any):
+        self._specs = dict(specs)
+        self._args = args
+        self._kwargs = kwargs
+        self._instances: Dict[str, Any] = {}
+        self._hooks: List[Callable[[str, Any], None]] = []
+        self._lock = threading.RLock()
+
+    def add_hook(self, hook: Callable[[str, Any], None]):
+        """Call hook(name, agent) for every agent built from now on"""
+        self._hooks.append(hook)
+
+    def __getitem__(self, name: str) -> Any:
+        agent = self._instances.get(name)
+        if agent is not None:
+            return agent
+        with self._lock:
+            if name not in self._instances:
+                module_name, class_name = self._specs[name].split(":")
+                agent_class = getattr(importlib.import_module(module_name), class_name)
+                agent = agent_class(*self._args, **self._kwargs)
+                for hook in self._hooks:
+                    hook(name, agent)
+                # Published only once wired, so the lock-free lookup above never sees a half-built agent
+                self._instances[name] = agent
+            return self._instances[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._specs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._specs)
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def proxy(self, name: str) -> LazyAgent:
+        """LazyAgent for name, to wire agents together without building them"""
+        if name not in self._specs:
+            raise KeyError(name)
+        return LazyAgent(self, name)
+
+    def loaded(self) -> List[str]:
+        """Names of the agents built so far"""
+        return list(self._instances)
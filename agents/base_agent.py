@@ -1,10 +1,126 @@
+import asyncio
+import json
+import weakref
+from typing import Any, Dict, Optional
+
+from .response_cache import make_cache_key
+
+# Connection pool shared by every agent running on the same event loop.
+# httpx connections are bound to the loop that opened them, so the pool is
+# keyed by loop and dropped automatically when the loop is garbage collected.
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+REQUEST_TIMEOUT = 60.0
+
+_http_clients = weakref.WeakKeyDictionary()
+_openai_clients = weakref.WeakKeyDictionary()
+
+
+def get_http_client():
+    """Return the pooled httpx client for the running event loop"""
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            timeout=REQUEST_TIMEOUT,
+        )
+        _http_clients[loop] = client
+    return client
+
+
+def get_async_openai_client(api_key: Optional[str]):
+    """Return an AsyncOpenAI client for api_key that uses the shared connection pool"""
+    import openai
+
+    loop = asyncio.get_running_loop()
+    http_client = get_http_client()
+    clients = _openai_clients.setdefault(loop, {})
+    key = (api_key, id(http_client))
+    client = clients.get(key)
+    if client is None:
+        client = openai.AsyncOpenAI(api_key=api_key, http_client=http_client)
+        clients[key] = client
+    return client
+
+
+async def close_shared_clients():
+    """Close the connection pool of the running event loop"""
+    loop = asyncio.get_running_loop()
+    _openai_clients.pop(loop, None)
+    client = _http_clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
+
 class Agent:
     """Base Agent class for the family connection system"""
-    
-    def __init__(self, name: str, system_prompt: str):
+
+    model = "gpt-4o"
+    max_tokens = 500
+    temperature = 0.7
+    empty_response = "I'm having trouble processing that right now."
+    error_response = "I'm having trouble processing that right now."
+
+    def __init__(self, name: str, system_prompt: str, openai_api_key: Optional[str] = None):
         self.name = name
         self.system_prompt = system_prompt
-        
+        self.openai_api_key = openai_api_key
+        # Opt-in ResponseCache; identical requests are answered from it when set
+        self.response_cache = None
+
+    @property
+    def openai_client(self):
+        """Async OpenAI client backed by the shared connection pool"""
+        return get_async_openai_client(self.openai_api_key)
+
     async def llm_call(self, prompt: str) -> str:
-        """Base method for LLM calls - to be implemented by subclasses"""
-        raise NotImplementedError("Subclasses must implement llm_call method") 
\ No newline at end of file
+        """Make a non-blocking call to the configured OpenAI model"""
+        try:
+            content = await self._complete(self._request_params(prompt, self.max_tokens))
+            return content or self.empty_response
+        except Exception as e:
+            print(f"Error calling OpenAI: {e}")
+            return self.error_response
+
+    async def llm_call_json(self, prompt: str, max_tokens: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Make a JSON-mode call and return the decoded object, or None on any failure"""
+        params = self._request_params(prompt, max_tokens or self.max_tokens)
+        params["response_format"] = {"type": "json_object"}
+        try:
+            data = json.loads(await self._complete(params) or "")
+            return data if isinstance(data, dict) else None
+        except Exception as e:
+            print(f"Error calling OpenAI in JSON mode: {e}")
+            return None
+
+    def _request_params(self, prompt: str, max_tokens: int) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": max_tokens,
+            "temperature": self.temperature
+        }
+
+    async def _complete(self, params: Dict[str, Any]) -> Optional[str]:
+        """Run a chat completion, going through the response cache when enabled"""
+        key = None
+        if self.response_cache is not None:
+            key = make_cache_key(params)
+            cached = await self.response_cache.aget(key)
+            if cached is not None:
+                return cached
+
+        response = await self.openai_client.chat.completions.create(**params)
+        content = response.choices[0].message.content
+        if key is not None and content:
+            await self.response_cache.aset(key, content)
+        return content
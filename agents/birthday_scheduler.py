@@ -0,0 +1,194 @@
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_LEDGER_PATH = os.getenv("BIRTHDAY_ALERT_LEDGER", "data/alert_ledger.json")
+
+
+class AlertLedger:
+    """Persisted record of the (person, date) birthday alerts already sent
+
+    The ledger is rewritten atomically on every change, so a crash never leaves
+    a half-written file behind. Entries older than keep_days are pruned.
+    Senders claim an alert before sending it and release it afterwards, so two
+    paths (the scheduler and a manual trigger) never send the same one at once.
+    """
+
+    def __init__(self, path: str = DEFAULT_LEDGER_PATH, keep_days: int = 400):
+        self.path = path
+        self.keep_days = keep_days
+        self._alerted: Dict[str, str] = {}
+        self._in_flight = set()
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def key(name: str, day: date) -> str:
+        return f"{day.isoformat()}|{name}"
+
+    def contains(self, name: str, day: date) -> bool:
+        return self.key(name, day) in self._alerted
+
+    def claim(self, name: str, day: date) -> bool:
+        """Reserve the alert for name on day; False if it was sent or is being sent"""
+        key = self.key(name, day)
+        with self._lock:
+            if key in self._alerted or key in self._in_flight:
+                return False
+            self._in_flight.add(key)
+            return True
+
+    def release(self, name: str, day: date, sent: bool):
+        """End a claim, recording the alert if it was sent"""
+        if sent:
+            self.record(name, day)
+        with self._lock:
+            self._in_flight.discard(self.key(name, day))
+
+    def record(self, name: str, day: date):
+        """Mark the alert for name on day as sent and persist the ledger"""
+        with self._lock:
+            self._alerted[self.key(name, day)] = datetime.now().isoformat()
+            self._prune(date.today())
+            self._save()
+
+    def _prune(self, today: date):
+        cutoff = (today - timedelta(days=self.keep_days)).isoformat()
+        for key in [key for key in self._alerted if key.split("|", 1)[0] < cutoff]:
+            del self._alerted[key]
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as file:
+                data = json.load(file)
+            self._alerted = dict(data.get("alerted", {}))
+        except FileNotFoundError:
+            self._alerted = {}
+        except (json.JSONDecodeError, AttributeError):
+            print(f"Alert Ledger: Invalid ledger file at {self.path}, starting empty")
+            self._alerted = {}
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as file:
+            json.dump({"alerted": self._alerted}, file, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class BirthdayScheduler:
+    """Event-driven birthday alerts for a MemoryAgent
+
+    Upcoming birthdays (today plus horizon_days) are kept in a min-heap ordered
+    by their alert time. The scheduler sleeps until the earliest one is due,
+    fires it through the memory agent and records it in the ledger, so neither
+    repeated wakeups nor restarts alert the same person twice on the same day.
+    An alert that fails goes back into the heap, due again after retry_delay
+    seconds, doubled on each failure up to max_retry_delay.
+    It wakes at least every max_sleep seconds to notice edits to the data file
+    and rebuilds the heap when the file or the current date changes.
+    """
+
+    def __init__(self, memory_agent, ledger: Optional[AlertLedger] = None,
+                 alert_time: time = time(9, 0), horizon_days: int = 7, max_sleep: float = 3600,
+                 retry_delay: float = 60, max_retry_delay: float = 3600):
+        self.memory_agent = memory_agent
+        self.store = memory_agent.birthday_store
+        self.ledger = ledger or memory_agent.alert_ledger
+        self.alert_time = alert_time
+        self.horizon_days = horizon_days
+        self.max_sleep = max_sleep
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._heap: List[Tuple[datetime, int, str, date, Dict[str, Any]]] = []
+        self._counter = itertools.count()
+        self._built_for: Optional[Tuple[int, date]] = None
+        # Failed alerts by ledger key: (failures so far, earliest retry)
+        self._retries: Dict[str, Tuple[int, datetime]] = {}
+
+    def rebuild(self, today: date):
+        """Recompute the heap of pending alerts from today onwards"""
+        self._heap = []
+        cutoff = today.isoformat()
+        self._retries = {key: retry for key, retry in self._retries.items() if key.split("|", 1)[0] >= cutoff}
+        for day, entry in self.store.upcoming(self.horizon_days, start=today):
+            name = entry.get("name", "Unknown")
+            if self.ledger.contains(name, day):
+                continue
+            due = datetime.combine(day, self.alert_time)
+            retry = self._retries.get(self.ledger.key(name, day))
+            if retry:
+                due = max(due, retry[1])
+            self._heap.append((due, next(self._counter), name, day, entry))
+        heapq.heapify(self._heap)
+        self._built_for = (self.store.version, today)
+
+    def pop_due(self, now: datetime) -> Dict[date, List[Dict[str, Any]]]:
+        """Remove and return the alerts due at now, grouped by birthday date"""
+        due: Dict[date, List[Dict[str, Any]]] = {}
+        while self._heap and self._heap[0][0] <= now:
+            _, _, name, day, entry = heapq.heappop(self._heap)
+            if not self.ledger.contains(name, day):
+                due.setdefault(day, []).append(entry)
+        return due
+
+    def seconds_until_next(self, now: datetime) -> float:
+        """How long to sleep: until the next alert, capped by max_sleep and midnight"""
+        tomorrow = datetime.combine(now.date() + timedelta(days=1), time(0, 0))
+        wake = min(tomorrow, now + timedelta(seconds=self.max_sleep))
+        if self._heap:
+            wake = min(wake, self._heap[0][0])
+        return max(0.0, (wake - now).total_seconds())
+
+    def reschedule(self, day: date, birthday: Dict[str, Any], now: datetime):
+        """Put a failed alert back into the heap with exponential backoff"""
+        name = birthday.get("name", "Unknown")
+        key = self.ledger.key(name, day)
+        failures = self._retries.get(key, (0, now))[0] + 1
+        delay = min(self.retry_delay * 2 ** (failures - 1), self.max_retry_delay)
+        due = now + timedelta(seconds=delay)
+        self._retries[key] = (failures, due)
+        heapq.heappush(self._heap, (due, next(self._counter), name, day, birthday))
+        print(f"Birthday Scheduler: Alert for {name} will be retried in {delay:.0f}s")
+
+    async def fire(self, day: date, birthdays: List[Dict[str, Any]], now: Optional[datetime] = None):
+        """Analyze and alert the birthdays of day; the ones not sent are rescheduled"""
+        print(f"Birthday Scheduler: {len(birthdays)} alert(s) due for {day.isoformat()}")
+        if not self.memory_agent.master_agent:
+            print("Birthday Scheduler: Master Agent not registered")
+        else:
+            try:
+                analyzed = await self.memory_agent.analyze_birthdays(birthdays, day)
+                await self.memory_agent.send_alerts(analyzed, day)
+            except Exception as e:
+                print(f"Birthday Scheduler: Alerts for {day.isoformat()} failed: {e}")
+        now = now or datetime.now()
+        for birthday in birthdays:
+            name = birthday.get("name", "Unknown")
+            if self.ledger.contains(name, day):
+                self._retries.pop(self.ledger.key(name, day), None)
+            else:
+                self.reschedule(day, birthday, now)
+
+    async def run_once(self, now: Optional[datetime] = None) -> float:
+        """Fire whatever is due and return the number of seconds to sleep"""
+        current = now or datetime.now()
+        self.store.refresh()
+        if self._built_for != (self.store.version, current.date()):
+            self.rebuild(current.date())
+        for day, birthdays in sorted(self.pop_due(current).items()):
+            await self.fire(day, birthdays, now)
+        return self.seconds_until_next(now or datetime.now())
+
+    async def run(self):
+        """Run forever, sleeping until the next alert is due"""
+        while True:
+            delay = await self.run_once()
+            await asyncio.sleep(delay)
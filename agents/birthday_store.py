@@ -0,0 +1,132 @@
+import calendar
+import json
+import os
+import threading
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def file_signature(path: str) -> Optional[Tuple[int, int]]:
+    """(mtime in ns, size) of path, or None when it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class BirthdayStore:
+    """Birthdays of a JSON data file indexed by (month, day)
+
+    The file is parsed once and every date is converted a single time; the
+    index is rebuilt only when the file's mtime or size changes. Lookups for a
+    given day are a dict access, so the cost does not depend on how many
+    birthdays the file holds. Returned entries are copies and can be modified
+    freely by the caller.
+    """
+
+    def __init__(self, data_file_path: str = "data/birthdays.json"):
+        self.data_file_path = data_file_path
+        # Incremented on every reload so dependent caches can detect changes
+        self.version = 0
+        self._signature = None
+        self._loaded = False
+        self._by_day: Dict[Tuple[int, int], List[Tuple[date, Dict[str, Any]]]] = {}
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def refresh(self) -> bool:
+        """Reload the file if it changed since the last load; True when reloaded"""
+        signature = file_signature(self.data_file_path)
+        with self._lock:
+            if self._loaded and signature == self._signature:
+                return False
+            self._by_day, self._count = self._build_index(self._read())
+            self._signature = signature
+            self._loaded = True
+            self.version += 1
+            return True
+
+    def entries_on(self, day: date) -> List[Tuple[date, Dict[str, Any]]]:
+        """(birth date, birthday) pairs falling on day
+
+        Birthdays on 29 February are reported on the 28th in common years.
+        """
+        self.refresh()
+        return self._lookup(day)
+
+    def on_date(self, day: date) -> List[Dict[str, Any]]:
+        """Birthdays falling on day"""
+        return [entry for _, entry in self.entries_on(day)]
+
+    def today(self) -> List[Dict[str, Any]]:
+        """Birthdays falling on the current date"""
+        return self.on_date(date.today())
+
+    def upcoming(self, days: int, start: Optional[date] = None) -> List[Tuple[date, Dict[str, Any]]]:
+        """(occurrence date, birthday) pairs from start (default today) over the next days days"""
+        start = start or date.today()
+        self.refresh()
+        occurrences = []
+        for offset in range(days + 1):
+            day = start + timedelta(days=offset)
+            occurrences.extend((day, entry) for _, entry in self._lookup(day))
+        return occurrences
+
+    def birth_date(self, entry: Dict[str, Any]) -> Optional[date]:
+        """Parsed date of a birthday entry, or None when it is not a valid YYYY-MM-DD date"""
+        value = entry.get("date")
+        # date.fromisoformat is much faster than strptime; the length check keeps
+        # it as strict as the "%Y-%m-%d" format used for the data files
+        if not isinstance(value, str) or len(value) != 10:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return None
+
+    def __len__(self) -> int:
+        self.refresh()
+        return self._count
+
+    def _lookup(self, day: date) -> List[Tuple[date, Dict[str, Any]]]:
+        entries = list(self._by_day.get((day.month, day.day), ()))
+        if day.month == 2 and day.day == 28 and not calendar.isleap(day.year):
+            entries.extend(self._by_day.get((2, 29), ()))
+        return [(birth_date, dict(entry)) for birth_date, entry in entries]
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.data_file_path, 'r') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            print(f"Birthday Store: Birthday file not found at {self.data_file_path}")
+        except json.JSONDecodeError:
+            print(f"Birthday Store: Invalid JSON in birthday file")
+        return {"birthdays": [], "events": []}
+
+    def _build_index(self, data: Dict[str, Any]):
+        by_day: Dict[Tuple[int, int], List[Tuple[date, Dict[str, Any]]]] = {}
+        count = 0
+        for entry in data.get("birthdays", []):
+            birth_date = self.birth_date(entry)
+            if birth_date is None:
+                print(f"Birthday Store: Invalid date format for {entry.get('name', 'Unknown')}")
+                continue
+            by_day.setdefault((birth_date.month, birth_date.day), []).append((birth_date, entry))
+            count += 1
+        return by_day, count
+
+
+_stores: Dict[str, BirthdayStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_birthday_store(data_file_path: str = "data/birthdays.json") -> BirthdayStore:
+    """Shared store for data_file_path, so every agent reuses the same index"""
+    key = os.path.abspath(data_file_path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = BirthdayStore(data_file_path)
+        return store
@@ -1,34 +1,36 @@
 import json
-from datetime import datetime, date
+from datetime import date
 from typing import List, Dict
+from .birthday_store import get_birthday_store
+from .event_store import get_event_store
 
 class FamilyAgent:
     def __init__(self, data_file="data/birthdays.json"):
         self.data_file = data_file
-        self.data = self.load_data()
+        self.birthday_store = get_birthday_store(data_file)
+        # Rendez-vous : journal en ajout seul + index trié par date, compactés périodiquement dans data_file
+        self.event_store = get_event_store(data_file)
 
     def load_data(self) -> Dict:
         try:
             with open(self.data_file, "r") as f:
-                return json.load(f)
+                data = json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
-            return {"birthdays": [], "events": []}
+            data = {"birthdays": [], "events": []}
+        # Les rendez-vous ajoutés depuis la dernière compaction ne sont encore que dans le journal
+        data["events"] = self.event_store.events()
+        return data
 
     def save_data(self):
-        with open(self.data_file, "w") as f:
-            json.dump(self.data, f, indent=2)
+        # Les ajouts sont déjà journalisés ; on force leur compaction (écriture atomique) dans le fichier
+        self.event_store.compact()
 
     def get_todays_birthdays(self) -> List[Dict]:
         today = date.today()
         birthdays_today = []
-        for entry in self.data.get("birthdays", []):
-            try:
-                bday = datetime.strptime(entry["date"], "%Y-%m-%d").date()
-                if bday.day == today.day and bday.month == today.month:
-                    entry["age"] = today.year - bday.year
-                    birthdays_today.append(entry)
-            except ValueError:
-                continue
+        for bday, entry in self.birthday_store.entries_on(today):
+            entry["age"] = today.year - bday.year
+            birthdays_today.append(entry)
         return birthdays_today
 
     def print_todays_birthdays(self):
@@ -44,21 +46,11 @@ class FamilyAgent:
             "date": date_str,
             "description": description
         }
-        self.data.setdefault("events", []).append(new_event)
-        self.save_data()
+        self.event_store.add(new_event)
         print(f"✅ Rendez-vous '{name}' ajouté pour le {date_str}.")
 
     def list_upcoming_events(self):
-        today = date.today()
-        events = []
-        for event in self.data.get("events", []):
-            try:
-                event_date = datetime.strptime(event["date"], "%Y-%m-%d").date()
-                if event_date >= today:
-                    events.append((event_date, event))
-            except ValueError:
-                continue
-        events.sort()
+        events = self.event_store.upcoming(date.today())
         if not events:
             print("📅 Aucun rendez-vous à venir.")
         else:
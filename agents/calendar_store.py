@@ -0,0 +1,255 @@
+import bisect
+import heapq
+import json
+import os
+import re
+import threading
+from datetime import datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from .birthday_store import file_signature
+from .intent_router import normalize
+
+JOURS = ["lundi", "mardi", "mercredi", "jeudi", "vendredi", "samedi", "dimanche"]
+MOIS = ["janvier", "février", "mars", "avril", "mai", "juin", "juillet",
+        "août", "septembre", "octobre", "novembre", "décembre"]
+
+# Words that designate an appointment type without naming it (normalised form -> type)
+TYPE_SYNONYMS = {
+    "medecin": "sante", "docteur": "sante", "medical": "sante", "medicaux": "sante",
+    "cardiologue": "sante", "dentiste": "sante",
+    "boulot": "travail", "reunion": "travail",
+    "foot": "sport", "match": "sport",
+}
+# Number of appointments listed when the question gives no period
+DEFAULT_LISTING = 5
+
+_APPOINTMENT = r"(?:rendez[\s-]?vous|rdv)"
+# "quels sont mes rendez-vous", "liste mes rdv", "mes rendez-vous prévus"...
+_LISTING_WORDS = re.compile(
+    r"\b(?:quels?|quelles?|liste[rz]?|tous|toutes)\s+(?:(?:sont|les|mes|des|nos|a-t-il)\s+)*" + _APPOINTMENT
+    + r"|\b" + _APPOINTMENT + r"\s+(?:prevus?|a\s+venir)\b"
+)
+_NEXT_WORDS = re.compile(r"\b(?:prochain|prochaine|suivant|suivante|quand)\b")
+# Questions about what to do with an appointment, which only GPT can answer
+_ACTION_WORDS = re.compile(
+    r"\b(?:annuler|annule|deplacer|reporter|modifier|changer|apporter|preparer|prendre|pourquoi|comment)\b"
+)
+
+
+def format_french_date(moment: datetime, with_time: bool = True) -> str:
+    """French long date, e.g. vendredi 18 juillet 2025 à 18h00"""
+    text = f"{JOURS[moment.weekday()]} {moment.day} {MOIS[moment.month - 1]} {moment.year}"
+    return f"{text} à {moment.strftime('%Hh%M')}" if with_time else text
+
+
+def parse_appointment_date(value: Any) -> Optional[datetime]:
+    """Datetime of an appointment's "date" field ("YYYY-MM-DD HH:MM:SS" or "YYYY-MM-DD")"""
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+class CalendarStore:
+    """Appointments of data/calendar.json in a time-sorted index
+
+    The file is parsed once, every date converted a single time, and the index
+    rebuilt only when the file's mtime or size changes. Besides the global
+    index, appointments are indexed by type (accent- and case-insensitive), so
+    "next Santé appointment" or "everything this week" is a bisect plus a
+    slice. answer() turns the common appointment questions into a French
+    answer without calling GPT.
+    """
+
+    def __init__(self, data_file_path: str = "data/calendar.json"):
+        self.data_file_path = data_file_path
+        self._signature = None
+        self._loaded = False
+        self._index: List[Tuple[datetime, int, Dict[str, Any]]] = []
+        self._by_type: Dict[str, List[Tuple[datetime, int, Dict[str, Any]]]] = {}
+        self._type_names: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self) -> bool:
+        """Reload the file if it changed since the last load; True when reloaded"""
+        signature = file_signature(self.data_file_path)
+        with self._lock:
+            if self._loaded and signature == self._signature:
+                return False
+            self._build_index(self._read())
+            self._signature = signature
+            self._loaded = True
+            return True
+
+    def between(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                appointment_type: Optional[str] = None, limit: Optional[int] = None) -> List[Tuple[datetime, Dict[str, Any]]]:
+        """(datetime, appointment) pairs with start <= datetime < end, optionally of one type"""
+        self.refresh()
+        with self._lock:
+            index = self._by_type.get(self.type_key(appointment_type), []) if appointment_type else self._index
+            low = bisect.bisect_left(index, (start,)) if start else 0
+            high = bisect.bisect_left(index, (end,)) if end else len(index)
+            if limit is not None:
+                high = min(high, low + limit)
+            return [(moment, dict(entry)) for moment, _, entry in index[low:high]]
+
+    def upcoming(self, appointment_type: Optional[str] = None, limit: Optional[int] = None,
+                 now: Optional[datetime] = None) -> List[Tuple[datetime, Dict[str, Any]]]:
+        """Appointments from now on, optionally of one type"""
+        return self.between(now or datetime.now(), None, appointment_type, limit)
+
+    def next(self, appointment_type: Optional[str] = None,
+             now: Optional[datetime] = None) -> Optional[Tuple[datetime, Dict[str, Any]]]:
+        """The next appointment, optionally of one type, or None"""
+        found = self.upcoming(appointment_type, 1, now)
+        return found[0] if found else None
+
+    def types(self) -> List[str]:
+        """Appointment types as written in the file"""
+        self.refresh()
+        with self._lock:
+            return sorted(self._type_names.values())
+
+    @staticmethod
+    def type_key(appointment_type: str) -> str:
+        return normalize(appointment_type)[0].strip()
+
+    def answer(self, query: str, now: Optional[datetime] = None) -> Optional[str]:
+        """French answer to a listing or date question about appointments, or None to let GPT handle it
+
+        Only questions asking when or which appointments are answered: a
+        period ("aujourd'hui", "demain", "cette semaine", "la semaine
+        prochaine", "ce mois-ci"), "prochain" / "quand" for the next
+        appointment, or a listing ("quels sont mes rendez-vous"), optionally
+        narrowed to a type ("Santé", "médecin", "travail"...). Anything else
+        about an appointment ("dois-je annuler...", "que dois-je apporter...")
+        returns None.
+        """
+        now = now or datetime.now()
+        text = normalize(query or "")[0]
+        if _ACTION_WORDS.search(text):
+            return None
+        period = self._find_period(text, now)
+        wants_next = bool(_NEXT_WORDS.search(text)) and period is None
+        if period is None and not wants_next and not _LISTING_WORDS.search(text):
+            return None
+
+        appointment_types = self._find_types(text)
+        names = " ou ".join(self._type_names[key] for key in appointment_types)
+        kind = f"rendez-vous {names}" if names else "rendez-vous"
+        if wants_next:
+            found = self._lookup(appointment_types, now, None, 1)
+            if not found:
+                return f"Aucun {kind} à venir."
+            return f"Votre prochain {kind} : {self._describe(*found[0])}."
+
+        if period is None:
+            found = self._lookup(appointment_types, now, None, DEFAULT_LISTING)
+            label = "à venir"
+        else:
+            start, end, label = period
+            found = self._lookup(appointment_types, start, end, None)
+        if not found:
+            return f"Aucun {kind} {label}."
+        lines = [f"Vos {kind} {label} :"] + [f"- {self._describe(moment, entry)}" for moment, entry in found]
+        return "\n".join(lines)
+
+    def _find_types(self, text: str) -> List[str]:
+        """Type keys named by the first word of text that designates a type
+
+        A word can be both a type of the file and a synonym of another one
+        ("Médecin" next to "Santé"): both types are returned then.
+        """
+        self.refresh()
+        with self._lock:
+            known = set(self._by_type)
+        for word in re.findall(r"\w+", text):
+            found = [key for key in (word, TYPE_SYNONYMS.get(word)) if key in known]
+            if found:
+                return found
+        return []
+
+    def _lookup(self, appointment_types: List[str], start: Optional[datetime], end: Optional[datetime],
+                limit: Optional[int]) -> List[Tuple[datetime, Dict[str, Any]]]:
+        """between() over several types (all of them when empty), merged in time order"""
+        if len(appointment_types) <= 1:
+            return self.between(start, end, appointment_types[0] if appointment_types else None, limit)
+        merged = heapq.merge(*(self.between(start, end, key, limit) for key in appointment_types),
+                             key=lambda item: item[0])
+        return list(merged)[:limit]
+
+    @staticmethod
+    def _find_period(text: str, now: datetime):
+        today = datetime.combine(now.date(), time())
+        if "aujourd'hui" in text or "ce soir" in text:
+            return now, today + timedelta(days=1), "aujourd'hui"
+        if "apres-demain" in text or "apres demain" in text:
+            return today + timedelta(days=2), today + timedelta(days=3), "après-demain"
+        if "demain" in text:
+            return today + timedelta(days=1), today + timedelta(days=2), "demain"
+        monday = today - timedelta(days=today.weekday())
+        if "semaine prochaine" in text:
+            return monday + timedelta(days=7), monday + timedelta(days=14), "la semaine prochaine"
+        if "cette semaine" in text:
+            return now, monday + timedelta(days=7), "cette semaine"
+        if "mois prochain" in text:
+            first = (today.replace(day=1) + timedelta(days=32)).replace(day=1)
+            return first, (first + timedelta(days=32)).replace(day=1), "le mois prochain"
+        if "ce mois" in text:
+            return now, (today.replace(day=1) + timedelta(days=32)).replace(day=1), "ce mois-ci"
+        return None
+
+    @staticmethod
+    def _describe(moment: datetime, entry: Dict[str, Any]) -> str:
+        description = f"{entry.get('titre', 'Rendez-vous')} le {format_french_date(moment)}"
+        if entry.get("localisation"):
+            description += f" ({entry['localisation']})"
+        return description
+
+    def _read(self) -> List[Dict[str, Any]]:
+        try:
+            with open(self.data_file_path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            print(f"Calendar Store: Calendar file not found at {self.data_file_path}")
+            return []
+        except json.JSONDecodeError:
+            print(f"Calendar Store: Invalid JSON in calendar file")
+            return []
+        return data if isinstance(data, list) else data.get("appointments", [])
+
+    def _build_index(self, entries: List[Dict[str, Any]]):
+        index = []
+        for sequence, entry in enumerate(entries):
+            moment = parse_appointment_date(entry.get("date"))
+            if moment is None:
+                print(f"Calendar Store: Invalid date format for {entry.get('titre', 'Unknown')}")
+                continue
+            index.append((moment, sequence, entry))
+        index.sort(key=lambda item: item[:2])
+        by_type: Dict[str, List[Tuple[datetime, int, Dict[str, Any]]]] = {}
+        type_names: Dict[str, str] = {}
+        for item in index:
+            name = item[2].get("type")
+            if name:
+                key = self.type_key(name)
+                by_type.setdefault(key, []).append(item)
+                type_names.setdefault(key, name)
+        self._index, self._by_type, self._type_names = index, by_type, type_names
+
+
+_stores: Dict[str, CalendarStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_calendar_store(data_file_path: str = "data/calendar.json") -> CalendarStore:
+    """Shared store for data_file_path, so every request reuses the same index"""
+    key = os.path.abspath(data_file_path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = CalendarStore(data_file_path)
+        return store
@@ -0,0 +1,213 @@
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .birthday_store import file_signature
+from .intent_router import normalize
+
+DEFAULT_FOLDERS = ("data", "script", "docs")
+# Approximate size of one chunk and default prompt budget, in tokens
+CHUNK_TOKENS = int(os.getenv("FILE_CONTEXT_CHUNK_TOKENS", "256"))
+DEFAULT_TOKEN_BUDGET = int(os.getenv("FILE_CONTEXT_TOKEN_BUDGET", "3000"))
+DEFAULT_TOP_K = int(os.getenv("FILE_CONTEXT_TOP_K", "8"))
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_TERM_PATTERN = re.compile(r"\w+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token), enough for budgeting"""
+    return len(text) // 4 + 1
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, accent-free terms of text with a trailing plural "s" removed,
+    so "Météo" matches "meteo" and "anniversaires" matches "anniversaire"
+    """
+    return [term[:-1] if len(term) > 3 and term.endswith("s") else term
+            for term in _TERM_PATTERN.findall(normalize(text)[0])]
+
+
+def split_chunks(text: str, chunk_tokens: int = CHUNK_TOKENS) -> List[str]:
+    """Split text on line boundaries into pieces of about chunk_tokens tokens
+
+    Lines longer than a whole chunk are cut on word boundaries.
+    """
+    chunks = []
+    current: List[str] = []
+    size = 0
+    for line in text.splitlines():
+        pieces = [line]
+        if estimate_tokens(line) > chunk_tokens:
+            words = line.split()
+            step = max(chunk_tokens * 4 // 6, 1)
+            pieces = [" ".join(words[i:i + step]) for i in range(0, len(words), step)]
+        for piece in pieces:
+            cost = estimate_tokens(piece)
+            if current and size + cost > chunk_tokens:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += cost
+    if current and any(piece.strip() for piece in current):
+        chunks.append("\n".join(current))
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+class Chunk:
+    """A piece of one indexed file"""
+
+    __slots__ = ("path", "text", "terms", "length", "tokens")
+
+    def __init__(self, path: str, text: str):
+        self.path = path
+        self.text = text
+        # File name terms are indexed too, so "calendar" finds calendar.json
+        self.terms = Counter(tokenize(text) + tokenize(os.path.basename(path)))
+        self.length = sum(self.terms.values())
+        self.tokens = estimate_tokens(text)
+
+
+class DocumentIndex:
+    """BM25 index over the files of a few folders, updated incrementally
+
+    Each file is split into chunks of about CHUNK_TOKENS tokens and indexed in
+    an inverted index. refresh() compares every file's (mtime, size) with the
+    one seen at the last indexing and only re-reads files that were added,
+    modified or removed, so a request on unchanged folders costs a few stat
+    calls. build_context() returns the best-scoring chunks for a query within a
+    token budget, instead of the content of every file.
+    """
+
+    def __init__(self, folders: Sequence[str] = DEFAULT_FOLDERS, chunk_tokens: int = CHUNK_TOKENS):
+        self.folders = tuple(folders)
+        self.chunk_tokens = chunk_tokens
+        self._signatures: Dict[str, Tuple[int, int]] = {}
+        self._file_chunks: Dict[str, List[int]] = {}
+        self._chunks: Dict[int, Chunk] = {}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._total_length = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def refresh(self) -> int:
+        """Re-index files that changed since the last call; returns how many did"""
+        with self._lock:
+            current = dict(self._list_files())
+            changed = 0
+            for path in list(self._signatures):
+                if path not in current:
+                    self._remove_file(path)
+                    changed += 1
+            for path, signature in current.items():
+                if self._signatures.get(path) != signature:
+                    self._remove_file(path)
+                    self._add_file(path, signature)
+                    changed += 1
+            return changed
+
+    def search(self, query: str, top_k: int = DEFAULT_TOP_K) -> List[Tuple[float, Chunk]]:
+        """The top_k chunks by BM25 score for query, best first (unmatched chunks excluded)"""
+        with self._lock:
+            count = len(self._chunks)
+            if not count:
+                return []
+            average_length = self._total_length / count
+            scores: Dict[int, float] = {}
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for chunk_id, frequency in postings.items():
+                    length = self._chunks[chunk_id].length
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+            best = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:top_k]
+            return [(score, self._chunks[chunk_id]) for chunk_id, score in best]
+
+    def build_context(self, query: str, top_k: int = DEFAULT_TOP_K,
+                      token_budget: int = DEFAULT_TOKEN_BUDGET) -> str:
+        """Relevant file excerpts for query, at most token_budget tokens
+
+        When no chunk shares a term with the query (e.g. a French question about
+        English data), chunks are taken in file order to fill the budget.
+        """
+        self.refresh()
+        selected = [chunk for _, chunk in self.search(query, top_k)]
+        if not selected:
+            with self._lock:
+                selected = [self._chunks[chunk_id] for chunk_id in sorted(self._chunks)]
+        context = ""
+        used = 0
+        for chunk in selected:
+            if used + chunk.tokens > token_budget:
+                continue
+            context += f"\nContenu du fichier {os.path.basename(chunk.path)}:\n{chunk.text}\n"
+            used += chunk.tokens
+        return context
+
+    def _list_files(self) -> Iterable[Tuple[str, Tuple[int, int]]]:
+        for folder in self.folders:
+            if not os.path.isdir(folder):
+                continue
+            for filename in sorted(os.listdir(folder)):
+                path = os.path.join(folder, filename)
+                if os.path.isfile(path):
+                    signature = file_signature(path)
+                    if signature is not None:
+                        yield path, signature
+
+    def _add_file(self, path: str, signature: Tuple[int, int]):
+        self._signatures[path] = signature
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                text = file.read()
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Document index: cannot read {path}: {e}")
+            self._file_chunks[path] = []
+            return
+        ids = []
+        for piece in split_chunks(text, self.chunk_tokens):
+            chunk_id = self._next_id
+            self._next_id += 1
+            chunk = Chunk(path, piece)
+            self._chunks[chunk_id] = chunk
+            self._total_length += chunk.length
+            for term, frequency in chunk.terms.items():
+                self._postings.setdefault(term, {})[chunk_id] = frequency
+            ids.append(chunk_id)
+        self._file_chunks[path] = ids
+
+    def _remove_file(self, path: str):
+        self._signatures.pop(path, None)
+        for chunk_id in self._file_chunks.pop(path, []):
+            chunk = self._chunks.pop(chunk_id)
+            self._total_length -= chunk.length
+            for term in chunk.terms:
+                postings = self._postings[term]
+                del postings[chunk_id]
+                if not postings:
+                    del self._postings[term]
+
+
+_indexes: Dict[Tuple[str, ...], DocumentIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_document_index(folders: Optional[Sequence[str]] = None) -> DocumentIndex:
+    """Shared index for a set of folders, so every request reuses the same one"""
+    key = tuple(os.path.abspath(folder) for folder in (folders or DEFAULT_FOLDERS))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = DocumentIndex(key)
+        return index
@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# Finished jobs kept for status lookups before the oldest are forgotten
+MAX_FINISHED_JOBS = 100
+
+
+class BackgroundEventLoop:
+    """A long-lived asyncio event loop running on a daemon thread
+
+    Synchronous code such as Flask handlers submits coroutines to it instead of
+    calling asyncio.run per request, so the agents' connection pools survive
+    between requests. Work started under a key is shared: a second caller
+    asking for the same key while it is in flight waits on the same future.
+    Jobs run without blocking the caller and can be polled by id.
+    """
+
+    def __init__(self, name: str = "agents-event-loop"):
+        self.loop = asyncio.new_event_loop()
+        self._inflight: Dict[str, Future] = {}
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._job_keys: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Awaitable) -> Future:
+        """Schedule coro on the loop and return a concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """Run coro on the loop and block the calling thread until it finishes"""
+        return self.submit(coro).result(timeout)
+
+    def shared_future(self, key: str, coro_factory: Callable[[], Awaitable]) -> Future:
+        """Future of the in-flight work for key, starting coro_factory() if there is none"""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self.submit(coro_factory())
+                self._inflight[key] = future
+                future.add_done_callback(lambda done, key=key: self._forget(key, done))
+            return future
+
+    def run_shared(self, key: str, coro_factory: Callable[[], Awaitable], timeout: Optional[float] = None) -> Any:
+        """Like run, but concurrent callers with the same key share one execution"""
+        return self.shared_future(key, coro_factory).result(timeout)
+
+    def submit_job(self, coro_factory: Callable[[], Awaitable], key: Optional[str] = None) -> str:
+        """Start a background job and return its id immediately
+
+        With a key, a job still running under that key is reused instead of
+        starting a second one.
+        """
+        with self._lock:
+            if key is not None and key in self._job_keys:
+                return self._job_keys[key]
+            job_id = uuid.uuid4().hex[:12]
+            self._jobs[job_id] = {
+                "id": job_id,
+                "status": "running",
+                "submitted_at": datetime.now().isoformat(),
+                "finished_at": None,
+                "error": None
+            }
+            if key is not None:
+                self._job_keys[key] = job_id
+        future = self.submit(coro_factory())
+        future.add_done_callback(lambda done: self._finish_job(job_id, key, done))
+        return job_id
+
+    def job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Status dict of a job ("running", "done" or "failed"), or None if unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def stop(self):
+        """Stop the loop and wait for its thread to exit"""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+
+    def _forget(self, key: str, future: Future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _finish_job(self, job_id: str, key: Optional[str], future: Future):
+        with self._lock:
+            job = self._jobs[job_id]
+            job["finished_at"] = datetime.now().isoformat()
+            if future.cancelled():
+                job["status"], job["error"] = "failed", "cancelled"
+            elif future.exception() is not None:
+                job["status"], job["error"] = "failed", str(future.exception())
+            else:
+                job["status"] = "done"
+            if key is not None and self._job_keys.get(key) == job_id:
+                del self._job_keys[key]
+            finished = [jid for jid, entry in self._jobs.items() if entry["status"] != "running"]
+            for old_id in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+                del self._jobs[old_id]
+
+
+_default_loop = None
+_default_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundEventLoop:
+    """Process-wide background event loop shared by the web apps"""
+    global _default_loop
+    with _default_loop_lock:
+        if _default_loop is None:
+            _default_loop = BackgroundEventLoop()
+        return _default_loop
@@ -0,0 +1,222 @@
+import bisect
+import hashlib
+import json
+import os
+import threading
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from .birthday_store import file_signature
+
+# Journaled additions folded into the JSON snapshot once this many have accumulated
+COMPACT_EVERY = int(os.getenv("EVENT_JOURNAL_COMPACT_EVERY", "100"))
+
+
+def parse_event_date(value: Any) -> Optional[date]:
+    """Date of an event's "date" field, or None when it is not a YYYY-MM-DD date"""
+    if not isinstance(value, str) or len(value) != 10:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+class EventStore:
+    """Family events of a JSON data file, kept in a date-sorted index
+
+    The "events" list of the snapshot file is loaded once. New events are
+    appended to a JSONL journal next to it (flushed and fsynced) instead of
+    rewriting the whole file, and inserted into the index with bisect, so
+    range queries are a bisect plus a slice (an insertion still shifts the
+    list, which is fine for a family calendar). Every compact_every additions
+    the journal is folded into the snapshot, written to a temporary file and
+    moved into place atomically, then truncated.
+
+    Each journal record carries a sequence number that grows until the journal
+    is truncated. Before replacing the snapshot, a compaction appends a "fold"
+    record with the last number folded in and the SHA-256 of the new
+    snapshot; the snapshot file itself keeps its schema. On replay, records up
+    to that number are skipped when the snapshot on disk is the one the fold
+    record describes, e.g. after a crash before the journal was truncated. A
+    fold record for another snapshot (crash before the replacement, or an
+    edit by hand) is ignored. A record cut short by a crash is dropped.
+    """
+
+    def __init__(self, snapshot_path: str = "data/birthdays.json", journal_path: Optional[str] = None,
+                 compact_every: int = COMPACT_EVERY):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or snapshot_path + ".journal"
+        self.compact_every = compact_every
+        self._events: List[Dict[str, Any]] = []
+        self._index: List[Tuple[date, int, Dict[str, Any]]] = []
+        self._journaled = 0
+        # Last sequence number written to the journal
+        self._last_seq = 0
+        self._signature = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def refresh(self) -> bool:
+        """(Re)load snapshot and journal if the snapshot changed on disk; True when reloaded"""
+        signature = file_signature(self.snapshot_path)
+        with self._lock:
+            if self._loaded and signature == self._signature:
+                return False
+            self._load()
+            self._signature = file_signature(self.snapshot_path)
+            self._loaded = True
+            return True
+
+    def add(self, event: Dict[str, Any]):
+        """Journal a new event and index it"""
+        self.refresh()
+        with self._lock:
+            self._append_journal({"op": "add", "seq": self._last_seq + 1, "event": event})
+            self._last_seq += 1
+            self._insert(event)
+            self._journaled += 1
+            if self._journaled >= self.compact_every:
+                self._compact()
+
+    def upcoming(self, start: Optional[date] = None, limit: Optional[int] = None) -> List[Tuple[date, Dict[str, Any]]]:
+        """(date, event) pairs on or after start (default today), in date order"""
+        return self.between(start or date.today(), None, limit)
+
+    def between(self, start: Optional[date] = None, end: Optional[date] = None,
+                limit: Optional[int] = None) -> List[Tuple[date, Dict[str, Any]]]:
+        """(date, event) pairs with start <= date < end, either bound optional"""
+        self.refresh()
+        with self._lock:
+            low = bisect.bisect_left(self._index, (start,)) if start else 0
+            high = bisect.bisect_left(self._index, (end,)) if end else len(self._index)
+            if limit is not None:
+                high = min(high, low + limit)
+            return [(event_date, dict(event)) for event_date, _, event in self._index[low:high]]
+
+    def events(self) -> List[Dict[str, Any]]:
+        """All events in insertion order, including those without a valid date"""
+        self.refresh()
+        with self._lock:
+            return [dict(event) for event in self._events]
+
+    def compact(self):
+        """Fold the journal into the snapshot now"""
+        self.refresh()
+        with self._lock:
+            self._compact()
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._events)
+
+    def _load(self):
+        snapshot = self._read_snapshot() or {}
+        self._events = list(snapshot.get("events", []))
+        self._last_seq = 0
+        self._journaled = 0
+        try:
+            with open(self.journal_path, 'r+b') as journal:
+                content = journal.read()
+                complete = content.rfind(b"\n") + 1
+                if complete < len(content):
+                    # Record cut short by a crash: drop it so the next append starts on a fresh line
+                    print(f"Event Store: Dropping incomplete journal record in {self.journal_path}")
+                    journal.truncate(complete)
+        except FileNotFoundError:
+            content, complete = b"", 0
+        records = []
+        for line in content[:complete].decode("utf-8").splitlines():
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                print(f"Event Store: Ignoring invalid journal record in {self.journal_path}")
+        digest = self._snapshot_digest()
+        folded_seq = 0
+        for record in records:
+            self._last_seq = max(self._last_seq, record.get("seq", 0))
+            if record.get("op") == "fold" and record.get("snapshot") == digest:
+                folded_seq = record["seq"]
+        for record in records:
+            if record.get("op") == "add" and record.get("seq", 0) > folded_seq:
+                self._events.append(record["event"])
+                self._journaled += 1
+        self._index = []
+        for sequence, event in enumerate(self._events):
+            event_date = parse_event_date(event.get("date"))
+            if event_date is not None:
+                self._index.append((event_date, sequence, event))
+        self._index.sort(key=lambda item: item[:2])
+
+    def _append_journal(self, record: Dict[str, Any]):
+        directory = os.path.dirname(self.journal_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.journal_path, 'a', encoding='utf-8') as journal:
+            journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+
+    def _insert(self, event: Dict[str, Any]):
+        sequence = len(self._events)
+        self._events.append(event)
+        event_date = parse_event_date(event.get("date"))
+        if event_date is not None:
+            bisect.insort(self._index, (event_date, sequence, event))
+
+    def _compact(self):
+        # The snapshot is re-read so that other sections (birthdays...) edited meanwhile are kept
+        data = self._read_snapshot()
+        if data is None:
+            print(f"Event Store: Not compacting into invalid {self.snapshot_path}, keeping the journal")
+            return
+        data["events"] = self._events
+        content = json.dumps(data, indent=2).encode("utf-8")
+        self._append_journal({"op": "fold", "seq": self._last_seq,
+                              "snapshot": hashlib.sha256(content).hexdigest()})
+        temporary = self.snapshot_path + ".tmp"
+        with open(temporary, 'wb') as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.snapshot_path)
+        self._truncate_journal()
+        self._journaled = 0
+        self._last_seq = 0
+        self._signature = file_signature(self.snapshot_path)
+
+    def _truncate_journal(self):
+        with open(self.journal_path, 'w', encoding='utf-8'):
+            pass
+
+    def _snapshot_digest(self) -> Optional[str]:
+        try:
+            with open(self.snapshot_path, 'rb') as file:
+                return hashlib.sha256(file.read()).hexdigest()
+        except FileNotFoundError:
+            return None
+
+    def _read_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Parsed snapshot, an empty one if missing, None if it is not valid JSON"""
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {"birthdays": [], "events": []}
+        except json.JSONDecodeError:
+            print(f"Event Store: Invalid JSON in {self.snapshot_path}")
+            return None
+
+
+_stores: Dict[str, EventStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_event_store(snapshot_path: str = "data/birthdays.json") -> EventStore:
+    """Shared store for snapshot_path, so every agent reuses the same index and journal"""
+    key = os.path.abspath(snapshot_path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = EventStore(snapshot_path)
+        return store
@@ -1,8 +1,19 @@
-import openai
-import os
+from agents.document_index import get_document_index
 
 # Configurez votre clé API OpenAI
-openai.api_key = 'TOKEN_API_OPENAI'
+OPENAI_API_KEY = 'TOKEN_API_OPENAI'
+
+# Dossiers indexés pour query_file_chatgpt
+CONTEXT_FOLDERS = ["data", "script", "docs"]
+
+def _openai():
+    """
+    Module openai configuré, importé à la première requête plutôt qu'au démarrage.
+    """
+    import openai
+
+    openai.api_key = OPENAI_API_KEY
+    return openai
 
 def query_chatgpt(prompt):
     """
@@ -12,7 +23,7 @@ def query_chatgpt(prompt):
     :return: La réponse de ChatGPT.
     """
     try:
-        response = openai.chat.completions.create(
+        response = _openai().chat.completions.create(
             model="gpt-3.5-turbo",  # ou un autre modèle selon disponibilité
             messages=[{"role": "user", "content": prompt}]
         )
@@ -20,34 +31,27 @@ def query_chatgpt(prompt):
     except Exception as e:
         return f"Une erreur est survenue : {e}"
 
+def build_file_context(user_query=""):
+    """
+    Extrait des fichiers des dossiers de contexte les passages les plus pertinents pour la requête,
+    dans la limite du budget de tokens (FILE_CONTEXT_TOKEN_BUDGET).
+    L'index n'est mis à jour que pour les fichiers modifiés depuis la dernière requête.
+    """
+    return get_document_index(CONTEXT_FOLDERS).build_context(user_query)
+
 def query_file_chatgpt(user_query):
     """
     Récupère des fichiers dans les dossiers spécifiés et utilise leur contenu
     pour contextualiser la conversation avec ChatGPT.
     """
-    context = ""
-
-    # Chemins vers les dossiers
-    folders = ["data", "script", "docs"]
-
-    # Lire les fichiers dans les dossiers spécifiés
-    for folder in folders:
-        if os.path.exists(folder):
-            for filename in os.listdir(folder):
-                filepath = os.path.join(folder, filename)
-                if os.path.isfile(filepath):
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as file:
-                            context += f"\nContenu du fichier {filename}:\n{file.read()}\n"
-                    except Exception as e:
-                        context += f"\nErreur lors de la lecture du fichier {filename}: {e}\n"
+    context = build_file_context(user_query)
 
     # Demander à l'utilisateur ce qu'il souhaite faire
     #user_query = input("Que souhaitez-vous faire avec ces fichiers ? ")
 
     # Envoyer la requête avec le contexte des fichiers
     try:
-        response = openai.chat.completions.create(
+        response = _openai().chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "system", "content": "Contexte: " + context},
@@ -58,6 +62,37 @@ def query_file_chatgpt(user_query):
     except Exception as e:
         return f"Une erreur est survenue : {e}"
 
+def _stream_completion(messages):
+    """
+    Envoie la requête en mode streaming et renvoie les fragments de texte au fur et à mesure.
+    """
+    try:
+        stream = _openai().chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=messages,
+            stream=True
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    except Exception as e:
+        yield f"Une erreur est survenue : {e}"
+
+def stream_chatgpt(prompt):
+    """
+    Variante streaming de query_chatgpt : génère la réponse fragment par fragment.
+    """
+    return _stream_completion([{"role": "user", "content": prompt}])
+
+def stream_file_chatgpt(user_query):
+    """
+    Variante streaming de query_file_chatgpt : génère la réponse fragment par fragment.
+    """
+    return _stream_completion([
+        {"role": "system", "content": "Contexte: " + build_file_context(user_query)},
+        {"role": "user", "content": user_query}
+    ])
+
 # Exemple d'utilisation
 #print(simple_chat_request("Bonjour, comment ça va ?"))
 #print(chat_with_context())
@@ -0,0 +1,142 @@
+"""
+Routeur d'intentions précompilé pour main_agent.
+
+Les mots-clés de toutes les intentions sont réunis dans une seule expression
+régulière, compilée une fois à l'import et parcourue une seule fois sur le
+texte normalisé (minuscules, sans accents). Quand plusieurs mots-clés sont
+présents, l'ordre de INTENT_PATTERNS donne la priorité, comme l'ancienne
+chaîne de if/elif. Les paramètres (phrase à traduire, ville...) sont lus par
+un motif précompilé ancré juste après le mot-clé, puis relus dans le texte
+d'origine. Le nom d'une ville s'arrête au premier mot de date ou de liaison
+(« météo de Paris demain » donne « Paris »).
+
+Ce routage coûte quelques microsecondes par requête, plus que les anciens
+tests `in` : scripts/bench_intent_router.py mesure les deux et vérifie les
+intentions et paramètres d'un corpus de requêtes.
+"""
+
+import re
+import unicodedata
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Mots qui font d'un « il fait » une question sur le temps (« il fait froid », pas « qu'est-ce qu'il fait »)
+WEATHER_WORDS = r"chaud|froid|beau|bon|doux|frais|gris|mauvais|moche|combien|quel\s+temps"
+
+# Mots qui terminent le nom d'une ville : dates, moments de la journée, suite de la question
+CITY_STOP = (
+    r"(?:demain|apres-demain|aujourd'hui|hier|maintenant|ce|cet|cette|ces|matin|soir|nuit|semaine"
+    r"|week-end|weekend|lundi|mardi|mercredi|jeudi|vendredi|samedi|dimanche|prochaine?|combien"
+    r"|quel|quelle|quels|quelles|comment|et|ou|s'il|svp|stp|il|fait|fait-il|pour|avec|la|le|les)\b"
+)
+_CITY_WORD = r"[a-z][\w'-]*"
+# Un article n'ouvre le nom que s'il est suivi d'un vrai mot (« Le Havre », pas « de la semaine »)
+CITY = (
+    rf"(?:(?:la|le|les)\s+|l')?(?!{CITY_STOP}){_CITY_WORD}"
+    rf"(?:\s+(?!{CITY_STOP}){_CITY_WORD}){{0,3}}"
+)
+
+# (intention, mots-clés, motif des paramètres lu après le mot-clé) par ordre de priorité ;
+# les motifs portent sur le texte normalisé
+INTENT_PATTERNS: List[Tuple[str, str, Optional[str]]] = [
+    ("translate", r"traduit|traduis|traduisez|traduire|traduction(?:\s+de)?|translate",
+     r"\s*:?\s+(?P<sentence>\S.*)"),
+    ("summarize", r"resumer?|resumez|resume-moi|synthetiser?|synthese", None),
+    # Questions sur les anniversaires seulement : « bon anniversaire mamie » reste une conversation
+    ("birthdays", r"dates?\s+(?:d'|des\s+)?anniversaires?"
+                  r"|quand\s+(?:est\s+|c'est\s+|tombe\s+)?l'anniversaire"
+                  r"|(?:quels?|quelles?|prochains?|liste\s+des)\s+anniversaires?"
+                  r"|anniversaires?\s+(?:a\s+venir|du\s+mois|de\s+la\s+semaine)", None),
+    ("appointments", r"rendez[\s-]?vous|rdv|agenda", None),
+    ("weather", r"meteo|quel\s+temps|il\s+fait\s+(?:" + WEATHER_WORDS + r")"
+                r"|(?:le\s+temps|il\s+fait)(?=\s+(?:a|au|sur|en)\s)",
+     r".*?\b(?:de|du|a|au|sur|pour|en)\s+(?P<city>" + CITY + r")"),
+    ("date_time", r"quel\s+jour|quelle\s+date|quelle\s+heure|on\s+est\s+quel|date\s+d'aujourd'hui", None),
+    ("music", r"musique|chanson|melodie|joue(?:r)?\s+(?:un|une|de\s+la)", None),
+    ("files", r"fichiers?|documents?|documentation", None),
+]
+
+INTENT_REGEX = re.compile(
+    r"\b(?:" + "|".join(f"(?P<{name}>{keywords})" for name, keywords, _ in INTENT_PATTERNS) + r")\b",
+    re.DOTALL,
+)
+SLOT_REGEXES = {name: re.compile(slots, re.DOTALL) for name, _, slots in INTENT_PATTERNS if slots}
+PRIORITY = {name: rank for rank, (name, _, _) in enumerate(INTENT_PATTERNS)}
+
+# Caractères retirés aux extrémités de chaque paramètre
+SLOT_STRIP = {"sentence": " \t", "city": " \t?!."}
+
+
+class _FoldTable(dict):
+    """Table pour str.translate : minuscule sans accent de chaque caractère, calculée à la demande."""
+
+    def __missing__(self, code):
+        char = chr(code)
+        if char in "’‘`":
+            folded = "'"
+        else:
+            decomposed = unicodedata.normalize("NFKD", char)
+            folded = "".join(part for part in decomposed if not unicodedata.combining(part)).lower()
+        self[code] = folded
+        return folded
+
+
+_FOLD = _FoldTable()
+
+
+class Intent(NamedTuple):
+    name: str
+    slots: Dict[str, str]
+
+
+def normalize(text: str) -> Tuple[str, Sequence[int]]:
+    """
+    Met le texte en minuscules et retire les accents.
+    Renvoie aussi, pour chaque caractère normalisé, sa position dans le texte d'origine.
+    """
+    if text.isascii():
+        return text.lower(), range(len(text))
+    folded = text.translate(_FOLD)
+    if len(folded) == len(text):
+        return folded, range(len(text))
+    # Certains caractères changent de longueur (ligatures, etc.) : on garde la correspondance
+    origin = []
+    for index, char in enumerate(text):
+        origin.extend([index] * len(_FOLD[ord(char)]))
+    return folded, origin
+
+
+def _original_span(text: str, origin: Sequence[int], start: int, end: int) -> str:
+    if start >= end:
+        return ""
+    return text[origin[start]:origin[end - 1] + 1]
+
+
+def dispatch(query: Optional[str]) -> Intent:
+    """
+    Associe la requête à une intention et à ses paramètres en un seul parcours du texte.
+    Les requêtes non reconnues renvoient l'intention "chat".
+    """
+    text = query or ""
+    normalized, origin = normalize(text)
+    best = None
+    for match in INTENT_REGEX.finditer(normalized):
+        if best is None or PRIORITY[match.lastgroup] < PRIORITY[best.lastgroup]:
+            best = match
+            if PRIORITY[best.lastgroup] == 0:
+                break
+    if best is None:
+        return Intent("chat", {})
+
+    name = best.lastgroup
+    slots = {}
+    slot_regex = SLOT_REGEXES.get(name)
+    slot_match = slot_regex.match(normalized, best.end()) if slot_regex else None
+    if slot_match:
+        for slot, value in slot_match.groupdict().items():
+            if value is None:
+                continue
+            start, end = slot_match.span(slot)
+            value = _original_span(text, origin, start, end).strip(SLOT_STRIP.get(slot, " \t"))
+            if value:
+                slots[slot] = value
+    return Intent(name, slots)
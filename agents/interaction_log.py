@@ -0,0 +1,254 @@
+import bisect
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_CAPACITY = int(os.getenv("AGENT_LOG_CAPACITY", "200"))
+LOG_DIRECTORY = os.getenv("AGENT_LOG_DIR", os.path.join("data", "logs"))
+# Spill files are namespaced per run; set AGENT_LOG_RUN_ID to keep one log across restarts
+RUN_ID = os.getenv("AGENT_LOG_RUN_ID") or f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}"
+# Earlier runs whose spill files are kept, per log; older ones are deleted at startup
+KEEP_RUNS = int(os.getenv("AGENT_LOG_KEEP_RUNS", "3"))
+# One (timestamp, byte offset) index entry is kept per this many spilled records
+SPILL_INDEX_STRIDE = 64
+
+
+def default_spill_path(name: str, run_id: str = RUN_ID, keep_runs: int = KEEP_RUNS) -> str:
+    """Spill file of this run for the log called name
+
+    Files left by earlier runs are pruned on the way, keeping the keep_runs
+    most recently written, so the log directory does not grow with every start.
+    """
+    path = os.path.join(LOG_DIRECTORY, f"{name}-{run_id}.jsonl")
+    prune_spill_files(name, keep_runs, exclude=path)
+    return path
+
+
+def prune_spill_files(name: str, keep_runs: int = KEEP_RUNS, exclude: Optional[str] = None) -> List[str]:
+    """Delete the spill files of the log called name but the keep_runs newest; returns the deleted paths"""
+    pattern = re.compile(re.escape(name) + r"-.+\.jsonl")
+    candidates = []
+    try:
+        filenames = os.listdir(LOG_DIRECTORY)
+    except FileNotFoundError:
+        return []
+    for filename in filenames:
+        path = os.path.join(LOG_DIRECTORY, filename)
+        if not pattern.fullmatch(filename) or path == exclude:
+            continue
+        try:
+            candidates.append((os.path.getmtime(path), path))
+        except OSError:
+            continue
+    candidates.sort(reverse=True)
+    deleted = []
+    for _, path in candidates[keep_runs:]:
+        try:
+            os.remove(path)
+            deleted.append(path)
+        except OSError:
+            # Already removed by another process starting at the same time
+            pass
+    return deleted
+
+
+class InteractionRecord:
+    """One logged interaction: the POSIX time it was logged plus the entry's fields
+
+    The entry keeps its own "timestamp" field, if any; the log orders and
+    filters on the logging time, which only grows.
+    """
+
+    __slots__ = ("timestamp", "data")
+
+    def __init__(self, timestamp: float, data: Dict[str, Any]):
+        self.timestamp = timestamp
+        self.data = data
+
+    def to_dict(self) -> Dict[str, Any]:
+        entry = {"timestamp": datetime.fromtimestamp(self.timestamp).isoformat()}
+        entry.update(self.data)
+        return entry
+
+    def to_json(self) -> str:
+        return json.dumps({"ts": self.timestamp, "data": self.data}, ensure_ascii=False, default=str)
+
+    @classmethod
+    def from_json(cls, line: str) -> "InteractionRecord":
+        raw = json.loads(line)
+        return cls(raw["ts"], raw["data"])
+
+
+class InteractionLog:
+    """Bounded interaction log: a ring buffer in memory, older records on disk
+
+    The newest capacity records stay in memory; older ones are appended to a
+    JSONL file at spill_path (or dropped when spill_path is None). Reads by
+    position or by time range cover both parts and return plain dicts, with
+    the timestamp as an ISO string like the original list entries. A sparse
+    offset index over the spill file lets those reads seek instead of scanning.
+
+    Records are stamped when appended, so the log is always in time order even
+    when callers build an entry long before logging it. Reads return at most
+    capacity entries unless a larger limit is asked for explicitly.
+    """
+
+    def __init__(self, spill_path: Optional[str] = None, capacity: int = DEFAULT_CAPACITY):
+        self.spill_path = spill_path
+        self.capacity = capacity
+        self._records = deque()
+        self._spilled = 0
+        self._spill_index: List[Tuple[float, int]] = []
+        self._last_timestamp = float("-inf")
+        self._lock = threading.Lock()
+        if spill_path:
+            self._index_spill_file()
+
+    def append(self, entry: Dict[str, Any]):
+        """Log one interaction given as a dict, stamped with the current time"""
+        with self._lock:
+            # Never go back in time, even if the wall clock does
+            self._last_timestamp = max(time.time(), self._last_timestamp)
+            record = InteractionRecord(self._last_timestamp, dict(entry))
+            self._records.append(record)
+            if len(self._records) > self.capacity:
+                self._spill(self._records.popleft())
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._records)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Every entry, oldest first, read from disk as the iteration goes"""
+        with self._lock:
+            records = list(self._records)
+            spilled = self._spilled
+        # The spill file is only ever appended to, so its first spilled lines stay valid
+        for record in self._iter_spilled(0, spilled):
+            yield record.to_dict()
+        for record in records:
+            yield record.to_dict()
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if index < 0:
+            index += len(self)
+        entries = self.page(offset=index, limit=1)
+        if not entries:
+            raise IndexError("interaction log index out of range")
+        return entries[0]
+
+    def page(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Entries offset .. offset + limit in logging order (oldest first); limit defaults to capacity"""
+        if limit is None:
+            limit = self.capacity
+        with self._lock:
+            records = list(self._records)
+            spilled = self._spilled
+            end = offset + limit
+            result = []
+            if offset < spilled:
+                result.extend(self._read_spilled(offset, min(end, spilled)))
+            start = max(offset - spilled, 0)
+            result.extend(record.to_dict() for record in records[start:max(end - spilled, 0)])
+            return result
+
+    def latest(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """The limit most recent entries (capacity by default), oldest first"""
+        if limit is None:
+            limit = self.capacity
+        with self._lock:
+            total = len(self)
+        return self.page(offset=max(total - limit, 0), limit=limit)
+
+    def between(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """The first limit entries (capacity by default) logged in [start, end), either bound optional"""
+        if limit is None:
+            limit = self.capacity
+        low = start.timestamp() if start else float("-inf")
+        high = end.timestamp() if end else float("inf")
+        with self._lock:
+            result = []
+            if self._spilled and (not self._records or self._records[0].timestamp > low):
+                position = bisect.bisect_left(self._spill_index, (low,)) - 1
+                first = max(position, 0) * SPILL_INDEX_STRIDE
+                for record in self._iter_spilled(first, self._spilled):
+                    if record.timestamp >= high or len(result) >= limit:
+                        break
+                    if record.timestamp >= low:
+                        result.append(record.to_dict())
+            for record in self._records:
+                if record.timestamp >= high or len(result) >= limit:
+                    break
+                if record.timestamp >= low:
+                    result.append(record.to_dict())
+            return result
+
+    def query(self, offset: Optional[int] = None, limit: Optional[int] = None,
+              start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Paginated read, optionally restricted to a time range
+
+        Without an offset or a range this returns the latest limit entries;
+        limit defaults to capacity, so reading further back means paging
+        explicitly.
+        """
+        if limit is None:
+            limit = self.capacity
+        if start is None and end is None:
+            if offset is None:
+                return self.latest(limit)
+            return self.page(offset, limit)
+        offset = offset or 0
+        return self.between(start, end, offset + limit)[offset:]
+
+    def _spill(self, record: InteractionRecord):
+        if not self.spill_path:
+            return
+        directory = os.path.dirname(self.spill_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.spill_path, 'ab') as file:
+            position = file.tell()
+            file.write(record.to_json().encode("utf-8") + b"\n")
+        if self._spilled % SPILL_INDEX_STRIDE == 0:
+            self._spill_index.append((record.timestamp, position))
+        self._spilled += 1
+
+    def _index_spill_file(self):
+        try:
+            with open(self.spill_path, 'r+b') as file:
+                position = 0
+                for line in file:
+                    if not line.endswith(b"\n"):
+                        # A crash mid-write left a partial record: drop it so appends start on a clean line
+                        file.truncate(position)
+                        break
+                    record = InteractionRecord.from_json(line.decode("utf-8"))
+                    if self._spilled % SPILL_INDEX_STRIDE == 0:
+                        self._spill_index.append((record.timestamp, position))
+                    self._last_timestamp = max(record.timestamp, self._last_timestamp)
+                    position += len(line)
+                    self._spilled += 1
+        except FileNotFoundError:
+            pass
+
+    def _iter_spilled(self, first: int, stop: int) -> Iterator[InteractionRecord]:
+        if first >= stop:
+            return
+        block = first // SPILL_INDEX_STRIDE
+        with open(self.spill_path, 'rb') as file:
+            file.seek(self._spill_index[block][1])
+            index = block * SPILL_INDEX_STRIDE
+            for line in file:
+                if index >= stop:
+                    break
+                if index >= first:
+                    yield InteractionRecord.from_json(line.decode("utf-8"))
+                index += 1
+
+    def _read_spilled(self, first: int, stop: int) -> List[Dict[str, Any]]:
+        return [record.to_dict() for record in self._iter_spilled(first, stop)]
@@ -1,57 +1,70 @@
-from agents.translation_agent import translate_text
-from agents.summary_agent import summarize_text
-import agents.calendar_agent
-from agents.weather_agent import get_weather
-from agents.music_agent import create_music
-from agents.gpt_agent import query_file_chatgpt, query_chatgpt
-import re
+# Les agents ne sont importés qu'au premier besoin (voir route_query), pour garder un démarrage rapide
+from agents.intent_router import dispatch
+from agents.calendar_store import get_calendar_store, format_french_date
+from datetime import datetime
+import json
 
 def main_agent(query):
-    if "traduit" in query or "traduire" in query or "traduction" in query:
-        sentence = None
-        # Recherche des différentes formes
-        match = re.search(r"traduit (.+)", query)
-        if match:
-            sentence = match.group(1)
-        else:
-            match = re.search(r"traduire (.+)", query)
-            if match:
-                sentence = match.group(1)
-            else:
-                match = re.search(r"traduction de (.+)", query)
-                if match:
-                    sentence = match.group(1)
-        
+    handler, _ = route_query(query)
+    return handler()
+
+def main_agent_stream(query):
+    """
+    Variante streaming de main_agent : renvoie la réponse fragment par fragment.
+    Les réponses GPT sont transmises au fil de l'eau, les autres d'un seul bloc.
+    """
+    handler, stream = route_query(query)
+    if stream is not None:
+        yield from stream()
+        return
+    response = handler()
+    yield response if isinstance(response, str) else json.dumps(response, ensure_ascii=False)
+
+def answer_date_time():
+    """
+    Donne la date et l'heure courantes sans passer par GPT.
+    """
+    now = datetime.now()
+    return f"Nous sommes le {format_french_date(now, with_time=False)}, il est {now.strftime('%H:%M')}."
+
+def route_query(query):
+    """
+    Choisit l'agent à utiliser pour la requête à l'aide du routeur d'intentions précompilé.
+    Renvoie (handler, stream_handler) ; stream_handler vaut None si l'agent ne sait pas streamer.
+    """
+    intent = dispatch(query)
+
+    if intent.name == "translate":
+        sentence = intent.slots.get("sentence")
         if sentence:  # Si une phrase a été trouvée
-            return translate_text(sentence)
-        else:
-            return "Aucune phrase à traduire trouvée."
-    elif "résumer" in query:
-        match = re.search(r"résumer de (\w+)", query)
-        return summarize_text(query)
-    elif "dates anniversaires" in query:
-        return query_file_chatgpt(query)
-    elif "rendez-vous" in query:
-        return query_file_chatgpt(query)
-    elif "météo" in query or "le temps à" in query or "il fait à" in query:
-        city = None
-        # Recherche des différentes formes
-        match = re.search(r"météo de (\w+)", query)
-        if match:
-            city = match.group(1)
-            #city = "paris"  # Vous pouvez extraire la ville de la requête si nécessaire
+            from agents.translation_agent import translate_text
+            return (lambda: translate_text(sentence)), None
         else:
-            match = re.search(r"le temps à (.+)", query)
-            if match:
-                city = match.group(1)
-            else:
-                match = re.search(r"il fait à (.+)", query)
-                if match:
-                    city = match.group(1)
-        return get_weather(city)
-    elif "musique" in query:
-        return create_music(query)
-    elif "fichier" in query or "document" in query or "documentation" in query:
-        query_file_chatgpt(query)
+            return (lambda: "Aucune phrase à traduire trouvée."), None
+    elif intent.name == "summarize":
+        from agents.summary_agent import summarize_text
+        return (lambda: summarize_text(query)), None
+    elif intent.name == "appointments":
+        # Questions courantes (prochain rendez-vous, cette semaine, par type) : réponse directe sans GPT
+        answer = get_calendar_store().answer(query)
+        if answer is not None:
+            return (lambda: answer), None
+        from agents.gpt_agent import query_file_chatgpt, stream_file_chatgpt
+        return (lambda: query_file_chatgpt(query)), (lambda: stream_file_chatgpt(query))
+    elif intent.name in ("birthdays", "files"):
+        from agents.gpt_agent import query_file_chatgpt, stream_file_chatgpt
+        return (lambda: query_file_chatgpt(query)), (lambda: stream_file_chatgpt(query))
+    elif intent.name == "weather":
+        city = intent.slots.get("city")
+        if not city:
+            return (lambda: "Pour quelle ville voulez-vous la météo ?"), None
+        from agents.weather_agent import get_weather
+        return (lambda: get_weather(city)), None
+    elif intent.name == "date_time":
+        return answer_date_time, None
+    elif intent.name == "music":
+        from agents.music_agent import create_music
+        return (lambda: create_music(query)), None
     else:
-        return query_chatgpt(query)
\ No newline at end of file
+        from agents.gpt_agent import query_chatgpt, stream_chatgpt
+        return (lambda: query_chatgpt(query)), (lambda: stream_chatgpt(query))
@@ -1,8 +1,160 @@
-from mingus.containers import Note
-from mingus.midi import fluidsynth
-
-def create_music():
-    note = Note("C", 4)
-    fluidsynth.init()
-    fluidsynth.play_Note(note)
-    return "Musique créée."
+import io
+import os
+import random
+import struct
+import wave
+from urllib.parse import urlencode
+
+from agents.intent_router import normalize
+from agents.response_cache import ResponseCache, make_cache_key
+
+# Soundfont utilisé par fluidsynth s'il est présent ; sinon le synthétiseur NumPy prend le relais
+SOUNDFONT_PATH = os.getenv("SOUNDFONT_PATH", "")
+SAMPLE_RATE = 22050
+# Durée d'un temps en ticks MIDI
+TICKS_PER_BEAT = 480
+CLIP_NOTES = 16
+
+# (mots-clés, gamme en demi-tons depuis la tonique, tonique MIDI, tempo)
+MOODS = [
+    (("triste", "melancol", "douce", "doux", "calme", "berceuse"), [0, 2, 3, 5, 7, 8, 10], 57, 72),
+    (("joyeu", "gai", "dansant", "rapide", "fete", "anniversaire"), [0, 2, 4, 5, 7, 9, 11], 60, 132),
+]
+DEFAULT_MOOD = ([0, 2, 4, 7, 9], 60, 100)
+
+FORMATS = {"wav": "audio/wav", "midi": "audio/midi"}
+
+_clips = ResponseCache(path=None, ttl=None, max_memory_entries=32)
+
+def build_sequence(query):
+    """
+    Construit une courte mélodie à partir de la requête : l'ambiance choisit la gamme
+    et le tempo, le texte sert de graine pour que la même requête donne la même mélodie.
+    Renvoie (tempo, [(note MIDI, durée en temps, vélocité), ...]).
+    """
+    text = normalize(query or "")[0]
+    scale, tonic, tempo = DEFAULT_MOOD
+    for keywords, mood_scale, mood_tonic, mood_tempo in MOODS:
+        if any(keyword in text for keyword in keywords):
+            scale, tonic, tempo = mood_scale, mood_tonic, mood_tempo
+            break
+
+    rng = random.Random(make_cache_key({"music": text}))
+    degree = 0
+    sequence = []
+    for index in range(CLIP_NOTES):
+        # Mouvement surtout conjoint, et retour à la tonique sur la dernière note
+        degree = max(-len(scale), min(len(scale) * 2 - 1, degree + rng.choice([-2, -1, -1, 1, 1, 2, 0])))
+        if index == CLIP_NOTES - 1:
+            degree = 0
+        octave, step = divmod(degree, len(scale))
+        duration = 2.0 if index == CLIP_NOTES - 1 else rng.choice([0.5, 0.5, 1.0, 1.0, 1.5])
+        sequence.append((tonic + 12 * octave + scale[step], duration, rng.randint(70, 100)))
+    return tempo, sequence
+
+def _varlen(value):
+    data = [value & 0x7F]
+    value >>= 7
+    while value:
+        data.append((value & 0x7F) | 0x80)
+        value >>= 7
+    return bytes(reversed(data))
+
+def render_midi(tempo, sequence):
+    """
+    Écrit la mélodie dans un fichier MIDI standard (format 0, une piste) en mémoire.
+    """
+    track = bytearray()
+    track += b"\x00\xff\x51\x03" + struct.pack(">I", 60000000 // tempo)[1:]
+    for note, duration, velocity in sequence:
+        track += b"\x00" + bytes([0x90, note, velocity])
+        track += _varlen(int(duration * TICKS_PER_BEAT)) + bytes([0x80, note, 0])
+    track += b"\x00\xff\x2f\x00"
+    header = b"MThd" + struct.pack(">IHHH", 6, 0, 1, TICKS_PER_BEAT)
+    return header + b"MTrk" + struct.pack(">I", len(track)) + bytes(track)
+
+def _synthesize_numpy(tempo, sequence, sample_rate):
+    import numpy as np
+
+    beat = 60.0 / tempo
+    pieces = []
+    for note, duration, velocity in sequence:
+        length = int(duration * beat * sample_rate)
+        t = np.arange(length) / sample_rate
+        frequency = 440.0 * 2 ** ((note - 69) / 12)
+        # Fondamentale et deux harmoniques, enveloppe attaque / décroissance exponentielle
+        tone = (np.sin(2 * np.pi * frequency * t)
+                + 0.4 * np.sin(4 * np.pi * frequency * t)
+                + 0.2 * np.sin(6 * np.pi * frequency * t))
+        envelope = np.minimum(t / 0.01, 1.0) * np.exp(-3.0 * t / max(duration * beat, 0.1))
+        pieces.append(tone * envelope * (velocity / 127) / 1.6)
+    samples = np.concatenate(pieces) if pieces else np.zeros(0)
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes(), 1
+
+def _synthesize_fluidsynth(tempo, sequence, sample_rate):
+    try:
+        import fluidsynth
+    except ImportError as e:
+        # pyfluidsynth absent, ou présent sans la bibliothèque système libfluidsynth
+        raise RuntimeError(f"fluidsynth indisponible (pip install pyfluidsynth et libfluidsynth requis) : {e}") from e
+
+    synth = fluidsynth.Synth(samplerate=float(sample_rate))
+    try:
+        soundfont = synth.sfload(SOUNDFONT_PATH)
+        synth.program_select(0, soundfont, 0, 0)
+        beat = 60.0 / tempo
+        chunks = []
+        for note, duration, velocity in sequence:
+            synth.noteon(0, note, velocity)
+            chunks.append(synth.get_samples(int(duration * beat * sample_rate)))
+            synth.noteoff(0, note)
+        import numpy as np
+        return np.concatenate(chunks).astype("<i2").tobytes(), 2
+    finally:
+        synth.delete()
+
+def render_wav(tempo, sequence, sample_rate=SAMPLE_RATE):
+    """
+    Rend la mélodie en WAV 16 bits en mémoire : avec fluidsynth si un soundfont est
+    configuré et disponible, sinon avec le petit synthétiseur NumPy.
+    """
+    frames = None
+    if SOUNDFONT_PATH and os.path.exists(SOUNDFONT_PATH):
+        try:
+            frames, channels = _synthesize_fluidsynth(tempo, sequence, sample_rate)
+        except Exception as e:
+            print(f"Rendu fluidsynth impossible, utilisation du synthétiseur NumPy : {e}")
+    if frames is None:
+        frames, channels = _synthesize_numpy(tempo, sequence, sample_rate)
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as output:
+        output.setnchannels(channels)
+        output.setsampwidth(2)
+        output.setframerate(sample_rate)
+        output.writeframes(frames)
+    return buffer.getvalue()
+
+def render_clip(query, fmt="wav"):
+    """
+    Renvoie (contenu, type MIME) du morceau correspondant à la requête, mis en cache par requête et format.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Format inconnu : {fmt}")
+    key = make_cache_key({"query": normalize(query or "")[0].strip(), "format": fmt})
+    clip = _clips.get(key)
+    if clip is None:
+        tempo, sequence = build_sequence(query)
+        clip = render_midi(tempo, sequence) if fmt == "midi" else render_wav(tempo, sequence)
+        _clips.set(key, clip)
+    return clip, FORMATS[fmt]
+
+def music_url(query, fmt="wav"):
+    return "/music?" + urlencode({"query": query or "", "format": fmt})
+
+def create_music(query=None):
+    """
+    Prépare le morceau demandé et renvoie le lien où l'écouter.
+    """
+    render_clip(query)
+    return f"Musique créée : {music_url(query)}"
@@ -0,0 +1,214 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(".cache", "llm_responses.sqlite3"))
+# Size-based eviction of the SQLite tier runs once every this many writes
+DISK_EVICTION_INTERVAL = 64
+# Disk hits update last_access in one batch once this many are pending
+ACCESS_FLUSH_INTERVAL = 64
+
+
+def make_cache_key(params: Dict[str, Any]) -> str:
+    """Content address of a request: SHA-256 of its canonical JSON form"""
+    canonical = json.dumps(params, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier response cache: an in-memory LRU in front of an optional SQLite file
+
+    Entries expire after ttl seconds (None keeps them until evicted). Each tier
+    is bounded by its own entry count and drops the least recently used entries
+    first. Values stored on disk must be JSON serialisable; with path=None the
+    cache is memory-only and accepts any object.
+
+    Disk hits record their access time in memory and write them in batches,
+    before any eviction and on close. Async code should use aget/aset, which
+    answer memory hits inline and run SQLite work in a thread.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH, ttl: Optional[float] = 7 * 24 * 3600,
+                 max_memory_entries: int = 512, max_disk_entries: int = 50000):
+        self.path = path
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._writes_since_eviction = 0
+        # key -> last access time not yet written to SQLite
+        self._pending_access: Dict[str, float] = {}
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL, last_access REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, expires_at = json.loads(row[0]), row[1]
+                    if expires_at is None or expires_at > now:
+                        self._pending_access[key] = now
+                        if len(self._pending_access) >= ACCESS_FLUSH_INTERVAL:
+                            self._flush_access()
+                            self._db.commit()
+                        self._remember(key, expires_at, value)
+                        self.stats["disk_hits"] += 1
+                        return value
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self.stats["misses"] += 1
+            return None
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """get() for async code: memory hits are answered inline, SQLite lookups in a thread"""
+        if self._db is None:
+            return self.get(key)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.time()):
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return entry[1]
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any, ttl: Optional[float] = None):
+        """set() for async code: the SQLite write runs in a thread"""
+        if self._db is None:
+            self.set(key, value, ttl)
+        else:
+            await asyncio.to_thread(self.set, key, value, ttl)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store value under key in both tiers"""
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self._db is not None:
+                self._pending_access.pop(key, None)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), expires_at, now)
+                )
+                self._writes_since_eviction += 1
+                if self._writes_since_eviction >= DISK_EVICTION_INTERVAL:
+                    self._evict_disk(now)
+                self._db.commit()
+            self.stats["stores"] += 1
+
+    def invalidate(self, key: str):
+        """Drop key from both tiers"""
+        with self._lock:
+            self._memory.pop(key, None)
+            if self._db is not None:
+                self._pending_access.pop(key, None)
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._pending_access.clear()
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters plus the current size of each tier"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["memory_entries"] = len(self._memory)
+            stats["disk_entries"] = (
+                self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] if self._db is not None else 0
+            )
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def close(self):
+        """Write pending access times and close the SQLite connection"""
+        with self._lock:
+            if self._db is not None:
+                self._flush_access()
+                self._db.commit()
+                self._db.close()
+                self._db = None
+
+    def _remember(self, key: str, expires_at: Optional[float], value: Any):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _flush_access(self):
+        if self._pending_access:
+            self._db.executemany(
+                "UPDATE responses SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._pending_access.items()]
+            )
+            self._pending_access.clear()
+
+    def _evict_disk(self, now: float):
+        self._writes_since_eviction = 0
+        # Least recently used is decided on up-to-date access times
+        self._flush_access()
+        self._db.execute("DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        excess = count - self.max_disk_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                (excess,)
+            )
+            self.stats["evictions"] += excess
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> ResponseCache:
+    """Process-wide cache stored at LLM_CACHE_PATH, shared by the agents that opt in"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
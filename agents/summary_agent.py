@@ -1,7 +1,331 @@
-from transformers import pipeline
+import multiprocessing
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from agents.response_cache import get_default_cache, make_cache_key
+
+# Réglages du pool de résumé ; chaque processus de travail charge son propre modèle (environ 2 Go)
+SUMMARY_WORKERS = int(os.getenv("SUMMARY_WORKERS", str(max(1, min(4, (os.cpu_count() or 2) // 2)))))
+SUMMARY_QUEUE_SIZE = int(os.getenv("SUMMARY_QUEUE_SIZE", "32"))
+SUMMARY_BATCH_SIZE = int(os.getenv("SUMMARY_BATCH_SIZE", "8"))
+# Attente maximale (en secondes) pour regrouper des demandes simultanées dans un même lot
+SUMMARY_BATCH_WINDOW = float(os.getenv("SUMMARY_BATCH_WINDOW", "0.02"))
+# Attente maximale pour une place dans la file, puis pour le résumé lui-même
+SUMMARY_QUEUE_TIMEOUT = float(os.getenv("SUMMARY_QUEUE_TIMEOUT", "5"))
+SUMMARY_TIMEOUT = float(os.getenv("SUMMARY_TIMEOUT", "300"))
+
+SUMMARY_PARAMS = {"max_length": 130, "min_length": 30, "do_sample": False}
+# Taille maximale d'un morceau envoyé au modèle, en mots (la fenêtre du modèle par défaut est de 1024 tokens)
+SUMMARY_CHUNK_WORDS = int(os.getenv("SUMMARY_CHUNK_WORDS", "500"))
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+
+# Modèle du processus courant (chargé dans chaque processus de travail, jamais à l'import)
+_summarizer = None
+
+
+def _load_summarizer():
+    """
+    Construit le pipeline de résumé au premier appel dans ce processus.
+    """
+    global _summarizer
+    if _summarizer is None:
+        from transformers import pipeline
+        _summarizer = pipeline("summarization")
+    return _summarizer
+
+
+def _summarize_batch(texts):
+    """
+    Résume une liste de textes en un seul appel au modèle (exécuté dans un processus de travail).
+    Renvoie (pid du processus, résumés).
+    """
+    summaries = _load_summarizer()(list(texts), **SUMMARY_PARAMS)
+    return os.getpid(), [summary['summary_text'] for summary in summaries]
+
+
+def _warm_up():
+    _load_summarizer()
+    return os.getpid()
+
+
+def split_chunks(text, chunk_words=SUMMARY_CHUNK_WORDS):
+    """
+    Découpe le texte aux limites de phrases en morceaux d'au plus chunk_words mots.
+    Une phrase plus longue qu'un morceau est coupée entre deux mots.
+    """
+    chunks = []
+    current = []
+    for sentence in _SENTENCE_END.split(text.strip()):
+        words = sentence.split()
+        while len(words) > chunk_words:
+            if current:
+                chunks.append(" ".join(current))
+                current = []
+            chunks.append(" ".join(words[:chunk_words]))
+            words = words[chunk_words:]
+        if current and len(current) + len(words) > chunk_words:
+            chunks.append(" ".join(current))
+            current = []
+        current.extend(words)
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+class SummaryWorkerPool:
+    """
+    Pool de processus dédié aux résumés.
+
+    Le modèle est chargé dans les processus de travail, pas dans le processus
+    Flask, et les résumés ne bloquent donc pas le GIL des requêtes. Les demandes
+    passent par une file bornée ; un thread de répartition regroupe celles qui
+    arrivent ensemble (jusqu'à batch_size, dans une fenêtre de batch_window
+    secondes) et les envoie au modèle en un seul lot.
+
+    Les processus sont lancés en mode "spawn" : un fork du processus Flask
+    copierait ses threads et ses verrous dans un état incohérent. Chaque
+    processus réimporte en revanche le script de lancement sous le nom
+    __mp_main__ : app.py ne démarre donc rien à l'import (orchestrateur, boucle
+    de fond, préchauffage), tout attend la première requête. ready passe à
+    vrai quand chacun des processus de travail a chargé le modèle.
+    """
+
+    def __init__(self, workers=SUMMARY_WORKERS, queue_size=SUMMARY_QUEUE_SIZE,
+                 batch_size=SUMMARY_BATCH_SIZE, batch_window=SUMMARY_BATCH_WINDOW):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.ready = threading.Event()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._slots = threading.Semaphore(workers)
+        self._executor = None
+        self._dispatcher = None
+        # Processus de travail du pool courant dont le modèle est chargé
+        self._warm_pids = set()
+        # Vrai après un warm_up : un pool remplacé est alors préchauffé à son tour
+        self._keep_warm = False
+        self._lock = threading.Lock()
+
+    def _new_executor(self):
+        self._warm_pids = set()
+        self.ready.clear()
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def start(self):
+        """
+        Démarre le pool et le thread de répartition s'ils ne tournent pas encore.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._new_executor()
+                self._dispatcher = threading.Thread(target=self._dispatch, name="summary-dispatcher", daemon=True)
+                self._dispatcher.start()
+            return self._executor
+
+    def warm_up(self):
+        """
+        Charge le modèle dans chaque processus de travail, en arrière-plan.
+        Renvoie un Future résolu quand tous les processus sont prêts.
+        """
+        self._keep_warm = True
+        done = Future()
+        threading.Thread(target=self._warm_up_all, args=(done,), name="summary-warm-up", daemon=True).start()
+        return done
+
+    def _warm_up_all(self, done):
+        # Un processus déjà prêt peut prendre plusieurs tâches de préchauffage :
+        # on en renvoie jusqu'à ce que chaque processus en ait exécuté une
+        try:
+            while not self.ready.is_set():
+                executor = self.start()
+                missing = self.workers - len(self._warm_pids)
+                pids = [future.result() for future in [executor.submit(_warm_up) for _ in range(missing)]]
+                if not self._mark_warm(executor, pids):
+                    time.sleep(0.05)
+        except Exception as e:
+            done.set_exception(e)
+            return
+        done.set_result(True)
+
+    def is_ready(self):
+        return self.ready.is_set()
+
+    def submit(self, text, timeout=None):
+        """
+        Met un texte en file et renvoie un Future de son résumé.
+        Lève queue.Full si la file est encore pleine après timeout secondes.
+        """
+        self.start()
+        future = Future()
+        self._queue.put((text, future), timeout=timeout)
+        return future
+
+    def summarize(self, text, queue_timeout=SUMMARY_QUEUE_TIMEOUT, timeout=SUMMARY_TIMEOUT):
+        return self.submit(text, timeout=queue_timeout).result(timeout)
+
+    def summarize_document(self, text, chunk_words=SUMMARY_CHUNK_WORDS,
+                           queue_timeout=SUMMARY_QUEUE_TIMEOUT, timeout=SUMMARY_TIMEOUT):
+        """
+        Résumé en map-reduce : le texte est découpé en morceaux qui tiennent dans la
+        fenêtre du modèle, chaque morceau est résumé (en parallèle sur les processus
+        de travail), puis la concaténation des résumés est résumée à son tour.
+        """
+        chunks = split_chunks(text, chunk_words)
+        while len(chunks) > 1:
+            partial = " ".join(self._map(chunks, queue_timeout, timeout))
+            # Si les résumés partiels dépassent encore la fenêtre, on recommence sur eux
+            reduced = split_chunks(partial, chunk_words)
+            if len(reduced) >= len(chunks):
+                # Les résumés ne raccourcissent plus le texte : dernier passage sur la concaténation
+                chunks = [partial]
+                break
+            chunks = reduced
+        return self.summarize(chunks[0] if chunks else text, queue_timeout, timeout)
+
+    def _map(self, chunks, queue_timeout, timeout):
+        """
+        Résume chaque morceau et renvoie les résumés dans l'ordre.
+
+        Au plus une fenêtre de morceaux est en file à la fois (de quoi occuper
+        tous les processus, et jamais plus de la moitié de la file), pour qu'un
+        long document ne remplisse pas la file à lui seul. En cas d'erreur, les
+        morceaux encore en attente sont annulés.
+        """
+        window = self.workers * self.batch_size
+        if self._queue.maxsize:
+            window = min(window, self._queue.maxsize // 2)
+        window = max(1, window)
+        pending = []
+        summaries = []
+        try:
+            for chunk in chunks:
+                if len(pending) >= window:
+                    summaries.append(pending.pop(0).result(timeout))
+                pending.append(self.submit(chunk, timeout=queue_timeout))
+            while pending:
+                summaries.append(pending.pop(0).result(timeout))
+        finally:
+            for future in pending:
+                future.cancel()
+        return summaries
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        # Les demandes en attente sont réparties entre les processus plutôt que regroupées dans un seul lot
+        limit = min(self.batch_size, max(1, -(-(self._queue.qsize() + 1) // self.workers)))
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get(timeout=self.batch_window))
+            except queue.Empty:
+                break
+        # Les demandes annulées entre-temps ne partent pas au modèle
+        return [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+
+    def _dispatch(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                continue
+            # Au plus un lot en cours par processus de travail ; les suivants attendent dans la file
+            self._slots.acquire()
+            try:
+                executor, done = self._submit_batch(batch)
+            except RuntimeError as e:
+                self._slots.release()
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            done.add_done_callback(lambda result, batch=batch, executor=executor: self._deliver(batch, executor, result))
+
+    def _submit_batch(self, batch):
+        with self._lock:
+            executor = self._executor
+        try:
+            return executor, executor.submit(_summarize_batch, [text for text, _ in batch])
+        except BrokenProcessPool:
+            # Pool cassé pendant qu'il était inactif : le lot n'a pas tourné, on le renvoie sur un pool neuf
+            executor = self._replace_broken(executor)
+            return executor, executor.submit(_summarize_batch, [text for text, _ in batch])
+
+    def _replace_broken(self, executor):
+        """
+        Remplace executor par un pool neuf s'il est encore le pool courant, et renvoie le pool courant.
+        """
+        with self._lock:
+            replaced = self._executor is executor
+            if replaced:
+                self._executor = self._new_executor()
+            current = self._executor
+        executor.shutdown(wait=False)
+        if replaced and self._keep_warm:
+            self.warm_up()
+        return current
+
+    def _mark_warm(self, executor, pids):
+        """
+        Note les processus de executor dont le modèle est chargé ; vrai si un nouveau s'ajoute.
+        """
+        with self._lock:
+            if executor is not self._executor:
+                return False
+            known = len(self._warm_pids)
+            self._warm_pids.update(pids)
+            if len(self._warm_pids) >= self.workers:
+                self.ready.set()
+            return len(self._warm_pids) > known
+
+    def _deliver(self, batch, executor, result):
+        self._slots.release()
+        error = result.exception()
+        if error is not None:
+            if isinstance(error, BrokenProcessPool):
+                # Un processus de travail est mort : on repart sur un pool neuf
+                self._replace_broken(executor)
+            for _, future in batch:
+                future.set_exception(error)
+            return
+        pid, summaries = result.result()
+        self._mark_warm(executor, [pid])
+        for (_, future), summary in zip(batch, summaries):
+            future.set_result(summary)
+
+
+_pool = SummaryWorkerPool()
+
+
+def warm_up_summarizer():
+    """
+    Lance le chargement du modèle en arrière-plan (par exemple au démarrage de l'application).
+    """
+    return _pool.warm_up()
+
+
+def summarizer_ready():
+    return _pool.is_ready()
 
-summarizer = pipeline("summarization")
 
 def summarize_text(text):
-    summary = summarizer(text, max_length=130, min_length=30, do_sample=False)
-    return summary[0]['summary_text']
+    """
+    Résume le texte, en map-reduce s'il dépasse la fenêtre du modèle.
+    Les résumés sont mis en cache selon le hachage du contenu.
+    """
+    cache = get_default_cache()
+    key = make_cache_key({"task": "summarization", "params": SUMMARY_PARAMS,
+                          "chunk_words": SUMMARY_CHUNK_WORDS, "text": text})
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    try:
+        summary = _pool.summarize_document(text)
+    except queue.Full:
+        return "Le service de résumé est saturé, veuillez réessayer dans un instant."
+    except Exception as e:
+        return f"Une erreur est survenue : {e}"
+    cache.set(key, summary)
+    return summary
@@ -1,10 +1,140 @@
-from deep_translator import GoogleTranslator
+import os
+import threading
+
+from agents.response_cache import ResponseCache, make_cache_key
+
+TRANSLATION_CACHE_PATH = os.getenv("TRANSLATION_CACHE_PATH", os.path.join(".cache", "translations.sqlite3"))
+# Taille maximale d'un appel groupé, sous la limite de 5000 caractères de Google Translate
+MAX_BATCH_CHARS = 4500
+# Les textes d'un lot sont envoyés en une seule requête, un par ligne
+BATCH_SEPARATOR = "\n"
+
+
+def google_translator_factory(source, target):
+    """
+    Crée un traducteur Google (deep_translator n'est importé qu'au premier besoin).
+    """
+    from deep_translator import GoogleTranslator
+    return GoogleTranslator(source=source, target=target)
+
+
+class TranslationService:
+    """
+    Traductions groupées et mises en cache.
+
+    Les textes identiques ne sont traduits qu'une fois, les traductions déjà
+    connues sont lues dans un cache persistant (LRU en mémoire devant un
+    fichier SQLite) et les autres sont envoyées ensemble, en aussi peu de
+    requêtes que possible. Un traducteur est créé par couple de langues et
+    par thread, puis réutilisé : GoogleTranslator garde les paramètres de la
+    requête en cours sur l'instance, qui ne peut donc pas servir à deux
+    threads à la fois. translator_factory(source, target) permet d'en fournir
+    un autre, par exemple un traducteur local pour les tests.
+    """
+
+    def __init__(self, translator_factory=google_translator_factory, cache=None):
+        self.translator_factory = translator_factory
+        self.cache = cache if cache is not None else ResponseCache(
+            TRANSLATION_CACHE_PATH, ttl=None, max_memory_entries=1024, max_disk_entries=20000
+        )
+        self._local = threading.local()
+
+    def translator(self, source, target):
+        """
+        Traducteur du thread courant pour ce couple de langues.
+        """
+        translators = getattr(self._local, "translators", None)
+        if translators is None:
+            translators = self._local.translators = {}
+        translator = translators.get((source, target))
+        if translator is None:
+            translator = translators[(source, target)] = self.translator_factory(source, target)
+        return translator
+
+    def translate_batch(self, texts, target_language='en', source_language='auto'):
+        """
+        Traduit une liste de textes et renvoie les traductions dans le même ordre.
+        """
+        results = {}
+        pending = []
+        for text in dict.fromkeys(texts):
+            if not text or not text.strip():
+                results[text] = text
+                continue
+            cached = self.cache.get(self._key(text, source_language, target_language))
+            if cached is not None:
+                results[text] = cached
+            else:
+                pending.append(text)
+
+        if pending:
+            translator = self.translator(source_language, target_language)
+            for group in self._groups(pending):
+                for text, translation in zip(group, self._translate_group(translator, group)):
+                    results[text] = translation
+                    if translation:
+                        self.cache.set(self._key(text, source_language, target_language), translation)
+        return [results[text] for text in texts]
+
+    @staticmethod
+    def _key(text, source, target):
+        return make_cache_key({"task": "translation", "source": source, "target": target, "text": text})
+
+    @staticmethod
+    def _groups(texts):
+        """
+        Regroupe les textes en lots d'au plus MAX_BATCH_CHARS caractères.
+        Un texte sur plusieurs lignes part seul, le séparateur ne pouvant pas le délimiter.
+        """
+        group = []
+        size = 0
+        for text in texts:
+            if BATCH_SEPARATOR in text or len(text) >= MAX_BATCH_CHARS:
+                yield [text]
+                continue
+            if group and size + len(BATCH_SEPARATOR) + len(text) > MAX_BATCH_CHARS:
+                yield group
+                group, size = [], 0
+            size += len(text) + (len(BATCH_SEPARATOR) if group else 0)
+            group.append(text)
+        if group:
+            yield group
+
+    @staticmethod
+    def _translate_group(translator, group):
+        if len(group) == 1:
+            return [translator.translate(group[0])]
+        joined = translator.translate(BATCH_SEPARATOR.join(group)) or ""
+        parts = joined.split(BATCH_SEPARATOR)
+        if len(parts) != len(group):
+            # Le service a fusionné ou coupé des lignes : un appel par texte
+            return [translator.translate(text) for text in group]
+        return [part.strip() for part in parts]
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_translation_service():
+    """
+    Service de traduction partagé, créé au premier appel.
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = TranslationService()
+        return _service
+
+
+def translate_batch(texts, target_language='en', source_language='auto'):
+    return get_translation_service().translate_batch(texts, target_language, source_language)
+
 
 def translate_text(text, target_language='en'):
-    translator = GoogleTranslator(source='auto', target=target_language)
-    translation = translator.translate(text)
-    return translation
+    return translate_batch([text], target_language)[0]
 
 # Exemple d'utilisation
 #translated_text = translate_text("Bonjour, comment ça va ?", 'en')
 #print(translated_text)
+#print(translate_batch(["Bonjour", "Joyeux anniversaire !", "Bonjour"], 'en'))
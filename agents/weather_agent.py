@@ -1,19 +1,29 @@
-import requests
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future
 from datetime import datetime
 
+from agents.base_agent import get_http_client
+
+# Point d'accès OpenWeather, modifiable pour viser un serveur local pendant les tests
+OPENWEATHER_URL = os.getenv("OPENWEATHER_URL", "http://api.openweathermap.org/data/2.5/weather")
+OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY", "OPEN_WEATHER_API")
+# Durée de validité d'une météo en cache, et délai maximal d'une requête (secondes)
+WEATHER_TTL = float(os.getenv("WEATHER_TTL", "600"))
+WEATHER_TIMEOUT = float(os.getenv("WEATHER_TIMEOUT", "10"))
+
 def deg_to_direction(deg):
     directions = ['N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW']
     ix = round(deg / 45) % 8
     return directions[ix]
 
-def get_weather(city):
-    api_key = 'OPEN_WEATHER_API'
-    url = f'http://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}&units=metric&lang=fr'
-
-    response = requests.get(url)
-    data = response.json()
-
-    if data.get("cod") != 200:
+def format_weather(city, data):
+    """
+    Met en forme la réponse OpenWeather, ou renvoie {"error": ...} si la requête a échoué.
+    """
+    if str(data.get("cod")) != "200":
         return {"error": data.get("message", "Impossible de récupérer les données météo.")}
 
     # Extraction des données
@@ -42,3 +52,144 @@ def get_weather(city):
     }
 
     return weather_info
+
+class WeatherClient:
+    """
+    Client OpenWeather avec connexions réutilisées et cache par ville.
+
+    La météo d'une ville est gardée ttl secondes. Quand plusieurs appels
+    demandent en même temps une ville absente du cache, une seule requête part
+    et les autres appels attendent son résultat. get_weather_async fait de même
+    sur la boucle asyncio courante, avec le pool httpx partagé des agents.
+    Les erreurs ne sont pas mises en cache.
+    """
+
+    def __init__(self, base_url=OPENWEATHER_URL, api_key=OPENWEATHER_API_KEY,
+                 ttl=WEATHER_TTL, timeout=WEATHER_TIMEOUT, pool_size=10):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.ttl = ttl
+        self.timeout = timeout
+        # requests n'est importé qu'à la création du client, pas au chargement du module
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._cache = {}
+        self._inflight = {}
+        self._async_inflight = {}
+        self._lock = threading.Lock()
+
+    def get_weather(self, city):
+        if not city:
+            return {"error": "Aucune ville indiquée."}
+        key = self._key(city)
+        with self._lock:
+            cached = self._cached(key)
+            if cached is not None:
+                return cached
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            info = self._fetch(city)
+            future.set_result(info)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._store(key, future)
+        return info
+
+    async def get_weather_async(self, city):
+        if not city:
+            return {"error": "Aucune ville indiquée."}
+        key = self._key(city)
+        with self._lock:
+            cached = self._cached(key)
+            if cached is not None:
+                return cached
+        loop = asyncio.get_running_loop()
+        task = self._async_inflight.get((loop, key))
+        if task is None:
+            task = loop.create_task(self._fetch_async(city))
+            self._async_inflight[(loop, key)] = task
+            task.add_done_callback(lambda done: self._async_done(loop, key, done))
+        return await asyncio.shield(task)
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _params(self, city):
+        return {"q": city, "appid": self.api_key, "units": "metric", "lang": "fr"}
+
+    def _fetch(self, city):
+        import requests
+
+        try:
+            response = self.session.get(self.base_url, params=self._params(city), timeout=self.timeout)
+            data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            return {"error": f"Impossible de récupérer les données météo : {e}"}
+        return format_weather(city, data)
+
+    async def _fetch_async(self, city):
+        try:
+            response = await get_http_client().get(self.base_url, params=self._params(city), timeout=self.timeout)
+            data = response.json()
+        except Exception as e:
+            return {"error": f"Impossible de récupérer les données météo : {e}"}
+        return format_weather(city, data)
+
+    def _async_done(self, loop, key, task):
+        self._async_inflight.pop((loop, key), None)
+        with self._lock:
+            self._store(key, task)
+
+    @staticmethod
+    def _key(city):
+        return city.strip().casefold()
+
+    def _cached(self, key):
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def _store(self, key, future):
+        # Appelé sous self._lock une fois la requête terminée
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        info = future.result()
+        if "error" not in info:
+            self._cache[key] = (time.monotonic() + self.ttl, info)
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_weather_client():
+    """
+    Client météo partagé, créé au premier appel.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = WeatherClient()
+        return _client
+
+def get_weather(city):
+    return get_weather_client().get_weather(city)
+
+async def get_weather_async(city):
+    return await get_weather_client().get_weather_async(city)
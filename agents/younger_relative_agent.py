@@ -1,11 +1,16 @@
 import asyncio
 import json
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from .base_agent import Agent
-import openai
+from .interaction_log import InteractionLog, default_spill_path
 
 class YoungerRelativeAgent(Agent):
+    max_tokens = 500
+    temperature = 0.7
+    empty_response = "No insights available."
+    error_response = "I'm having trouble analyzing that right now."
+
     def __init__(self, openai_api_key: str):
         super().__init__(
             name="Younger Relative Agent",
@@ -17,11 +22,11 @@ class YoungerRelativeAgent(Agent):
             4. Suggest meaningful ways to engage with elderly family members
             5. Consider emotional and practical aspects of family relationships
             
-            Always be supportive, understanding, and focused on strengthening family bonds."""
+            Always be supportive, understanding, and focused on strengthening family bonds.""",
+            openai_api_key=openai_api_key
         )
-        self.openai_client = openai.OpenAI(api_key=openai_api_key)
         self.master_agent = None
-        self.notifications = []
+        self.notifications = InteractionLog(default_spill_path("younger_relative_notifications"))
         
     def register_master_agent(self, master_agent):
         """Register the master agent for communication"""
@@ -53,7 +58,6 @@ class YoungerRelativeAgent(Agent):
         insights = await self.llm_call(prompt)
         print(f"Younger Relative Agent Insights: {insights}")
         
-        # Log the notification
         notification = {
             "timestamp": datetime.now().isoformat(),
             "elderly_response": response,
@@ -62,13 +66,21 @@ class YoungerRelativeAgent(Agent):
             "insights": insights,
             "action_taken": "analyzed_and_insights_provided"
         }
-        self.notifications.append(notification)
         
         # Generate specific suggestions based on the interaction
-        await self.generate_suggestions(response, context, insights)
+        await self.generate_suggestions(response, context, insights, notification)
+        
+        # Log the notification once it is complete; logged records are immutable
+        self.notifications.append(notification)
+        
+    async def generate_suggestions(self, response: str, context: Dict[str, Any], insights: str,
+                                   notification: Optional[Dict[str, Any]] = None) -> str:
+        """Generate specific, actionable suggestions for the younger relative
         
-    async def generate_suggestions(self, response: str, context: Dict[str, Any], insights: str):
-        """Generate specific, actionable suggestions for the younger relative"""
+        The suggestions are attached to notification, the record of the interaction
+        they belong to, so concurrent birthday chains never write into each other's
+        records.
+        """
         birthday_info = context.get("birthday_info", {})
         
         prompt = f"""
@@ -90,26 +102,17 @@ class YoungerRelativeAgent(Agent):
         print(f"Younger Relative Agent Suggestions: {suggestions}")
         
         # Add suggestions to the notification
-        if self.notifications:
-            self.notifications[-1]["suggestions"] = suggestions
-            
-    async def llm_call(self, prompt: str) -> str:
-        """Make a call to OpenAI GPT-4o"""
-        try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=500,
-                temperature=0.7
-            )
-            return response.choices[0].message.content or "No insights available."
-        except Exception as e:
-            print(f"Error calling OpenAI: {e}")
-            return "I'm having trouble analyzing that right now."
+        if notification is not None:
+            notification["suggestions"] = suggestions
+        return suggestions
             
-    def get_notifications(self) -> List[Dict]:
-        """Get notification history for demo purposes"""
-        return self.notifications 
\ No newline at end of file
+    def get_notifications(self, offset: Optional[int] = None, limit: Optional[int] = None,
+                          start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict]:
+        """Get notification history for demo purposes
+        
+        Entries are returned oldest first; offset/limit paginate and start/end
+        restrict the result to a time range. Without an offset or a range this
+        returns the latest entries, at most the log's capacity unless limit
+        asks for more.
+        """
+        return self.notifications.query(offset, limit, start, end) 
\ No newline at end of file
@@ -1,5 +1,10 @@
-from flask import Flask, render_template, request, jsonify
-from agents.main_agent import main_agent
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context, send_file
+import io
+import json
+import os
+from agents.main_agent import main_agent, main_agent_stream
+from agents.music_agent import render_clip, FORMATS as MUSIC_FORMATS
+from agents.summary_agent import warm_up_summarizer, summarizer_ready
 
 app = Flask(__name__)
 
@@ -14,5 +19,38 @@ def query():
     response = main_agent(user_query)
     return jsonify({'response': response})
 
+@app.route('/query/stream', methods=['POST'])
+def query_stream():
+    data = request.json
+    user_query = data.get('query')
+
+    def events():
+        # Server-Sent Events : un évènement par fragment, puis "done"
+        for token in main_agent_stream(user_query):
+            yield f"data: {json.dumps({'token': token})}\n\n"
+        yield "event: done\ndata: {}\n\n"
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/music')
+def music():
+    # Morceau rendu en mémoire (WAV ou MIDI), servi avec prise en charge des requêtes partielles
+    user_query = request.args.get('query', '')
+    fmt = request.args.get('format', 'wav')
+    if fmt not in MUSIC_FORMATS:
+        return jsonify({'error': f"Format inconnu : {fmt}"}), 400
+    clip, mimetype = render_clip(user_query, fmt)
+    extension = 'mid' if fmt == 'midi' else fmt
+    return send_file(io.BytesIO(clip), mimetype=mimetype, download_name=f'musique.{extension}')
+
+@app.route('/summary/status')
+def summary_status():
+    # Vrai une fois le modèle de résumé chargé dans le pool de processus
+    return jsonify({'ready': summarizer_ready()})
+
 if __name__ == '__main__':
+    # Chargement anticipé du modèle de résumé, en arrière-plan
+    if os.getenv('SUMMARY_WARMUP') == '1':
+        warm_up_summarizer()
     app.run(debug=True)
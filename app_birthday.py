@@ -1,29 +1,55 @@
 # app_flask.py
-from flask import Flask, render_template, redirect, url_for, flash
+from flask import Flask, render_template, redirect, url_for, flash, jsonify
 import os
-import asyncio
+import threading
 from main import FamilyConnectionOrchestrator
+from agents.event_loop import get_background_loop
 
 app = Flask(__name__)
-<<<<<<< HEAD
-app.secret_key = "TOKEN_API_FLASK"
-=======
-app.secret_key = "replace-with-a-secure-secret"
->>>>>>> 105f2ca28f2c8d5cc20dc1224055068bb84f1d54
-
-# Initialize orchestrator
-orchestrator = FamilyConnectionOrchestrator(os.getenv("TOKEN_API_OPENAI"))
-memory_agent = orchestrator.agents["memory"]
-elderly_agent = orchestrator.agents["elderly"]
-master_agent = orchestrator.agents["master"]
-younger_agent = orchestrator.agents["younger_relative"]
+app.secret_key = os.getenv("FLASK_SECRET_KEY", "TOKEN_API_FLASK")
+
+# Built on the first request, not at import: processes spawned by
+# multiprocessing re-import the launching script as __mp_main__, and must not
+# start a background loop or a GPT call of their own
+orchestrator = None
+# Long-lived event loop the routes submit agent coroutines to
+background_loop = None
+_startup_lock = threading.Lock()
+
+def start_services():
+    """Build the orchestrator and the background loop once, then warm up the analysis"""
+    global orchestrator, background_loop
+    if background_loop is not None:
+        return
+    with _startup_lock:
+        if background_loop is not None:
+            return
+        # Agents are looked up in orchestrator.agents on each use: the registry only
+        # imports and builds an agent the first time it is needed
+        orchestrator = FamilyConnectionOrchestrator(os.getenv("OPENAI_API_KEY"))
+        background_loop = get_background_loop()
+    # Warm up the analysis in the background so the first page view is fast; the
+    # memory agent itself is built there, on the loop thread, not at import
+    daily_analysis()
+
+app.before_request(start_services)
+
+async def _daily_analysis():
+    return await orchestrator.agents["memory"].get_daily_analysis()
+
+def daily_analysis():
+    """Today's birthday analysis, shared by concurrent requests while it is computed"""
+    return background_loop.shared_future("daily_analysis", _daily_analysis)
 
 @app.route("/")
 def dashboard():
-    birthdays = asyncio.run(memory_agent.analyze_todays_birthdays())
-    master_log = master_agent.get_conversation_log()
-    elderly_responses = elderly_agent.get_user_responses()
-    notifications = younger_agent.get_notifications()
+    agents = orchestrator.agents
+    birthdays = agents["memory"].get_cached_analysis()
+    if birthdays is None:
+        birthdays = daily_analysis().result()
+    master_log = agents["master"].get_conversation_log()
+    elderly_responses = agents["elderly"].get_user_responses()
+    notifications = agents["younger_relative"].get_notifications()
     
     return render_template("dashboard.html",
                            birthdays=birthdays,
@@ -33,9 +59,17 @@ def dashboard():
 
 @app.route("/trigger")
 def trigger_reminders():
-    asyncio.run(memory_agent.check_and_alert())
-    flash("🎉 Rappels d’anniversaire déclenchés !")
+    job_id = background_loop.submit_job(orchestrator.agents["memory"].check_and_alert, key="check_and_alert")
+    flash(f"🎉 Rappels d’anniversaire déclenchés ! (tâche {job_id})")
     return redirect(url_for('dashboard'))
 
+@app.route("/jobs/<job_id>")
+def job_status(job_id):
+    status = background_loop.job_status(job_id)
+    if status is None:
+        return jsonify({'error': 'unknown job'}), 404
+    return jsonify(status)
+
 if __name__ == "__main__":
+    start_services()
     app.run(debug=True)
@@ -0,0 +1,136 @@
+"""
+Circuit breaker shared by the standalone FamilyConnect agents
+
+Kept free of web framework imports, so it can be copied next to each agent
+and tested on its own.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Circuit breaker settings shared by the LLM backends: the breaker opens when,
+# over the last BREAKER_WINDOW calls (at least BREAKER_MIN_CALLS), the share of
+# failed calls or of calls slower than BREAKER_SLOW_CALL_SECONDS reaches its
+# threshold, then lets one trial call through after BREAKER_OPEN_SECONDS
+BREAKER_WINDOW = int(os.getenv('BREAKER_WINDOW', '20'))
+BREAKER_MIN_CALLS = int(os.getenv('BREAKER_MIN_CALLS', '5'))
+BREAKER_ERROR_RATE = float(os.getenv('BREAKER_ERROR_RATE', '0.5'))
+BREAKER_SLOW_CALL_SECONDS = float(os.getenv('BREAKER_SLOW_CALL_SECONDS', '10'))
+BREAKER_SLOW_RATE = float(os.getenv('BREAKER_SLOW_RATE', '0.5'))
+BREAKER_OPEN_SECONDS = float(os.getenv('BREAKER_OPEN_SECONDS', '30'))
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a backend whose circuit breaker is open"""
+
+class CircuitBreaker:
+    """Per-backend circuit breaker with error-rate and latency thresholds
+    
+    closed: calls go through and their outcome is recorded in a sliding window.
+    open: calls fail at once with CircuitOpenError, so the caller moves on to
+    the next backend instead of waiting for a timeout.
+    half_open: after open_seconds a single trial call is let through; it
+    closes the breaker if it succeeds in time and reopens it otherwise.
+    
+    Every state change starts a new generation, and allow() hands out the
+    current one as the call's ticket. An outcome recorded with the ticket of an
+    earlier generation, such as a call started before the breaker opened and
+    finishing during the trial, is ignored.
+    """
+    
+    def __init__(self, name: str, window: int = BREAKER_WINDOW, min_calls: int = BREAKER_MIN_CALLS,
+                 error_rate: float = BREAKER_ERROR_RATE, slow_call_seconds: float = BREAKER_SLOW_CALL_SECONDS,
+                 slow_rate: float = BREAKER_SLOW_RATE, open_seconds: float = BREAKER_OPEN_SECONDS):
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_rate = slow_rate
+        self.open_seconds = open_seconds
+        self.state = "closed"
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        # (failed, slow) outcome of the most recent calls
+        self._calls = deque(maxlen=window)
+        self._trial_in_flight = False
+        self._generation = 1
+    
+    def allow(self) -> Optional[int]:
+        """Ticket of a call that may go to the backend now, or None when it may not"""
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.open_seconds:
+            self._set_state("half_open")
+            logger.info(f"Circuit breaker {self.name}: half-open, trying one call")
+        if self.state == "closed":
+            return self._generation
+        if self.state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return self._generation
+        self.rejected += 1
+        return None
+    
+    def record(self, ticket: int, success: bool, seconds: float):
+        """Record the outcome of a call let through by allow() with ticket"""
+        if ticket != self._generation:
+            return
+        slow = seconds >= self.slow_call_seconds
+        if self.state == "half_open":
+            if success and not slow:
+                self._set_state("closed")
+                logger.info(f"Circuit breaker {self.name}: closed")
+            else:
+                self._open()
+            return
+        self._calls.append((not success, slow))
+        if len(self._calls) >= self.min_calls:
+            failures = sum(1 for failed, _ in self._calls if failed) / len(self._calls)
+            slow_calls = sum(1 for _, was_slow in self._calls if was_slow) / len(self._calls)
+            if failures >= self.error_rate or slow_calls >= self.slow_rate:
+                self._open()
+    
+    async def call(self, operation):
+        """Await operation() through the breaker; a None result counts as a failure"""
+        ticket = self.allow()
+        if ticket is None:
+            raise CircuitOpenError(f"{self.name} circuit breaker is open")
+        started = time.monotonic()
+        try:
+            result = await operation()
+        except asyncio.CancelledError:
+            # Not the backend's fault: free the trial slot without recording anything
+            if ticket == self._generation and self.state == "half_open":
+                self._trial_in_flight = False
+            raise
+        except Exception:
+            self.record(ticket, False, time.monotonic() - started)
+            raise
+        self.record(ticket, result is not None, time.monotonic() - started)
+        return result
+    
+    def snapshot(self) -> Dict[str, Any]:
+        calls = len(self._calls)
+        return {
+            "state": self.state,
+            "recent_calls": calls,
+            "error_rate": round(sum(1 for failed, _ in self._calls if failed) / calls, 2) if calls else 0.0,
+            "slow_rate": round(sum(1 for _, slow in self._calls if slow) / calls, 2) if calls else 0.0,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected
+        }
+    
+    def _set_state(self, state: str):
+        self.state = state
+        self._generation += 1
+        self._trial_in_flight = False
+        self._calls.clear()
+    
+    def _open(self):
+        self._set_state("open")
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        logger.warning(f"Circuit breaker {self.name}: open for {self.open_seconds:.0f}s")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Load test for the standalone FamilyConnect agents
+
+Sends chat completions to an agent with an increasing number of concurrent
+users and reports latency percentiles per concurrency level. On a
+non-blocking agent p99 stays close to the upstream latency as users are
+added; a blocking one grows with the number of users.
+
+To reproduce a slow upstream, start the fake GenAI backend and point the
+agent at it:
+
+    python load-test.py --fake-backend 8900 --backend-delay 0.5
+    GENAI_BACKEND_URL=http://localhost:8900 python standalone_grace_agent.py
+    python load-test.py --url http://localhost:8001 --levels 1,10,50,100
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def user(url, message, requests_per_user, timeout, ready, start, latencies, errors):
+    """One simulated user, with its own connection, sending its requests one after the other"""
+    payload = {
+        "model": "load-test",
+        "messages": [{"role": "user", "content": message}],
+        "temperature": 0.7,
+        "max_tokens": 200
+    }
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        # Connect before the level starts, so the timings measure the request path and not the handshake
+        try:
+            await client.get(f"{url}/health")
+        except Exception as e:
+            errors.append(str(e))
+            return
+        finally:
+            ready.release()
+        await start.wait()
+        for _ in range(requests_per_user):
+            started = time.perf_counter()
+            try:
+                response = await client.post(f"{url}/v1/chat/completions", json=payload)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+            except Exception as e:
+                errors.append(str(e))
+
+
+async def run_level(url, users, requests_per_user, message, timeout):
+    """Latencies, errors and duration of one concurrency level"""
+    latencies, errors = [], []
+    ready = asyncio.Semaphore(0)
+    start = asyncio.Event()
+    tasks = [
+        asyncio.create_task(user(url, message, requests_per_user, timeout, ready, start, latencies, errors))
+        for _ in range(users)
+    ]
+    for _ in range(users):
+        await ready.acquire()
+    started = time.perf_counter()
+    start.set()
+    await asyncio.gather(*tasks)
+    return latencies, errors, time.perf_counter() - started
+
+
+async def run(args):
+    levels = [int(level) for level in args.levels.split(",")]
+    print(f"Load test of {args.url} ({args.requests_per_user} requests per user)\n")
+    print(f"{'users':>6} {'ok':>6} {'errors':>7} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for users in levels:
+        latencies, errors, elapsed = await run_level(
+            args.url, users, args.requests_per_user, args.message, args.timeout
+        )
+        if latencies:
+            p50 = statistics.median(latencies) * 1000
+            p99 = percentile(latencies, 0.99) * 1000
+            worst = max(latencies) * 1000
+        else:
+            p50 = p99 = worst = float("nan")
+        throughput = len(latencies) / elapsed if elapsed else 0.0
+        print(f"{users:>6} {len(latencies):>6} {len(errors):>7} {throughput:>8.1f} {p50:>9.1f} {p99:>9.1f} {worst:>9.1f}")
+        if errors:
+            print(f"       first error: {errors[0]}")
+
+
+async def fake_backend(port, delay):
+    """Minimal GenAI backend answering /health at once and chat completions after delay seconds"""
+
+    async def handle(reader, writer):
+        try:
+            request_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value.strip())
+            if length:
+                await reader.readexactly(length)
+            if b"/v1/chat/completions" in request_line:
+                await asyncio.sleep(delay)
+                body = {"choices": [{"message": {"role": "assistant", "content": "Hello from the fake backend"}}]}
+            else:
+                body = {"status": "healthy"}
+            data = json.dumps(body).encode("utf-8")
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                         + f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode("ascii") + data)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "0.0.0.0", port, backlog=1024)
+    print(f"Fake GenAI backend on port {port}, {delay:.2f}s per chat completion (Ctrl+C to stop)")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for the standalone FamilyConnect agents")
+    parser.add_argument("--url", default="http://localhost:8001", help="agent base URL")
+    parser.add_argument("--levels", default="1,10,50,100,200", help="comma-separated numbers of concurrent users")
+    parser.add_argument("--requests-per-user", type=int, default=5)
+    parser.add_argument("--message", default="Hello, how are you today?")
+    parser.add_argument("--timeout", type=float, default=60.0, help="client timeout per request, in seconds")
+    parser.add_argument("--fake-backend", type=int, metavar="PORT", help="serve a fake GenAI backend instead")
+    parser.add_argument("--backend-delay", type=float, default=0.5, help="fake backend latency, in seconds")
+    args = parser.parse_args()
+
+    try:
+        if args.fake_backend:
+            asyncio.run(fake_backend(args.fake_backend, args.backend_delay))
+        else:
+            asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -7,15 +7,17 @@ import os
 import json
 import logging
 import asyncio
+import time
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Annotated
+from typing import Dict, List, Any, Optional, Annotated, NamedTuple
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 import uvicorn
+import httpx
 import openai
-from openai import OpenAI
-import requests
+from openai import AsyncOpenAI
 import nest_asyncio
+from circuit_breaker import CircuitBreaker, CircuitOpenError
 
 # GenAI session class (simplified for Docker deployment)
 class GenAISession:
@@ -34,6 +36,30 @@ nest_asyncio.apply()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Pooled HTTP connections shared by the GenAI, OpenAI and weather calls
+HTTP_MAX_CONNECTIONS = int(os.getenv('HTTP_MAX_CONNECTIONS', '100'))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('HTTP_MAX_KEEPALIVE_CONNECTIONS', '20'))
+# Per-request timeouts in seconds
+GENAI_TIMEOUT = float(os.getenv('GENAI_TIMEOUT', '30'))
+OPENAI_TIMEOUT = float(os.getenv('OPENAI_TIMEOUT', '60'))
+WEATHER_TIMEOUT = float(os.getenv('WEATHER_TIMEOUT', '10'))
+# GenAI backend health probe: seconds between probes and per-probe timeout
+GENAI_PROBE_INTERVAL = float(os.getenv('GENAI_PROBE_INTERVAL', '30'))
+GENAI_PROBE_TIMEOUT = float(os.getenv('GENAI_PROBE_TIMEOUT', '5'))
+
+class BackendRouting(NamedTuple):
+    """Backends used to answer, with the probe result they were decided from
+    
+    Replaced as a whole after each probe, so a request reading it once always
+    sees a consistent set of flags.
+    """
+    use_genai: bool
+    use_openai: bool
+    probe_ok: Optional[bool] = None
+    probe_latency_ms: Optional[float] = None
+    probed_at: Optional[str] = None
+    probe_error: Optional[str] = None
+
 # Request/Response models
 class ChatMessage(BaseModel):
     role: str
@@ -80,32 +106,115 @@ Your communication style:
 
 When coordinating care, always prioritize safety and wellbeing while keeping family members informed and involved in care decisions."""
         
-        # Initialize GenAI network client first, then OpenAI as fallback
+        # GenAI network first, then OpenAI as fallback. The GenAI backend is
+        # probed in the background (see probe_loop); until the first probe
+        # answers, OpenAI is used when a key is available.
         self.genai_backend_url = os.getenv('GENAI_BACKEND_URL', 'http://genai-backend:8000')
-        self.use_genai = self.test_genai_connection()
+        self.openai_api_key = os.getenv('OPENAI_API_KEY')
+        self.routing = BackendRouting(use_genai=False, use_openai=bool(self.openai_api_key))
+        self.probe_task: Optional[asyncio.Task] = None
+        self.breakers = {"genai": CircuitBreaker("genai"), "openai": CircuitBreaker("openai")}
         
         # Log the configuration for debugging
         logger.info(f"GenAI Backend URL: {self.genai_backend_url}")
-        logger.info(f"GenAI Connection: {'enabled' if self.use_genai else 'disabled'}")
         
-        # Initialize OpenAI client as fallback
-        api_key = os.getenv('OPENAI_API_KEY')
-        if api_key and not self.use_genai:
-            self.client = OpenAI(api_key=api_key)
-            self.use_openai = True
-            logger.info("Alex Agent initialized with OpenAI API (GenAI not available)")
-        else:
-            self.client = None
-            self.use_openai = False
-            if self.use_genai:
-                logger.info("Alex Agent initialized with GenAI network")
-            else:
-                logger.info("Alex Agent initialized with local responses")
+        # Async HTTP and OpenAI clients, created on first use (or at app startup) and closed on shutdown
+        self.http_client: Optional[httpx.AsyncClient] = None
+        self.client: Optional[AsyncOpenAI] = None
         
         # Initialize GenAI session for advanced capabilities
         self.genai_session = None
         self.setup_genai_session()
     
+    def get_http_client(self) -> httpx.AsyncClient:
+        """Pooled async HTTP client shared by every request of this agent"""
+        if self.http_client is None or self.http_client.is_closed:
+            self.http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS
+                ),
+                timeout=GENAI_TIMEOUT
+            )
+            self.client = None
+        return self.http_client
+    
+    def get_openai_client(self) -> AsyncOpenAI:
+        """AsyncOpenAI client sending its requests through the shared pool"""
+        http_client = self.get_http_client()
+        if self.client is None:
+            self.client = AsyncOpenAI(api_key=self.openai_api_key, http_client=http_client, timeout=OPENAI_TIMEOUT)
+        return self.client
+    
+    @property
+    def use_genai(self) -> bool:
+        return self.routing.use_genai
+    
+    @property
+    def use_openai(self) -> bool:
+        return self.routing.use_openai
+    
+    async def probe_genai(self) -> BackendRouting:
+        """Check the GenAI backend health once and update the routing flags"""
+        started = asyncio.get_running_loop().time()
+        error = None
+        try:
+            response = await self.get_http_client().get(f"{self.genai_backend_url}/health", timeout=GENAI_PROBE_TIMEOUT)
+            healthy = response.status_code == 200
+            if not healthy:
+                error = f"HTTP {response.status_code}"
+        except Exception as e:
+            healthy = False
+            error = str(e) or type(e).__name__
+        latency_ms = round((asyncio.get_running_loop().time() - started) * 1000, 1)
+        
+        previous = self.routing
+        self.routing = BackendRouting(
+            use_genai=healthy,
+            use_openai=bool(self.openai_api_key) and not healthy,
+            probe_ok=healthy,
+            probe_latency_ms=latency_ms,
+            probed_at=datetime.now().isoformat(timespec="seconds"),
+            probe_error=error
+        )
+        if previous.probe_ok is None or previous.use_genai != healthy:
+            if healthy:
+                logger.info(f"Alex Agent using GenAI network ({latency_ms} ms)")
+            elif self.routing.use_openai:
+                logger.info(f"Alex Agent using OpenAI API (GenAI not available: {error})")
+            else:
+                logger.info(f"Alex Agent using local responses (GenAI not available: {error})")
+        return self.routing
+    
+    async def probe_loop(self):
+        """Probe the GenAI backend now and then every GENAI_PROBE_INTERVAL seconds"""
+        while True:
+            try:
+                await self.probe_genai()
+            except Exception as e:
+                logger.error(f"GenAI probe failed: {e}")
+            await asyncio.sleep(GENAI_PROBE_INTERVAL)
+    
+    async def start(self):
+        """Open the connection pool and start probing the GenAI backend in the background"""
+        self.get_http_client()
+        if self.probe_task is None or self.probe_task.done():
+            self.probe_task = asyncio.create_task(self.probe_loop())
+    
+    async def close(self):
+        """Stop probing and close the connection pool"""
+        if self.probe_task is not None:
+            self.probe_task.cancel()
+            try:
+                await self.probe_task
+            except asyncio.CancelledError:
+                pass
+            self.probe_task = None
+        if self.http_client is not None:
+            await self.http_client.aclose()
+        self.http_client = None
+        self.client = None
+    
     def setup_genai_session(self):
         """Setup GenAI session for advanced capabilities"""
         try:
@@ -149,18 +258,23 @@ When coordinating care, always prioritize safety and wellbeing while keeping fam
         if "file" in last_message or "document" in last_message:
             return "I can help access and review care documents. Please provide the file ID or document reference, and I'll coordinate the information with family members."
         
+        # Routing flags read once, so a probe finishing meanwhile cannot mix two states
+        routing = self.routing
+        
         # Try GenAI network first
-        if self.use_genai:
+        if routing.use_genai:
             try:
-                genai_response = await self.generate_genai_response(messages)
+                genai_response = await self.breakers["genai"].call(lambda: self.generate_genai_response(messages))
                 if genai_response:
                     return genai_response
+            except CircuitOpenError:
+                pass
             except Exception as e:
                 logger.error(f"GenAI network error: {e}")
                 # Fall through to OpenAI or local response
         
-        # Try OpenAI as fallback
-        if self.use_openai and self.client:
+        # Try OpenAI as fallback, also when the GenAI backend is up but did not answer
+        if routing.use_openai or (routing.use_genai and self.openai_api_key):
             try:
                 # Convert messages to OpenAI format
                 openai_messages = [{"role": msg.role, "content": msg.content} for msg in messages]
@@ -180,15 +294,17 @@ You have access to advanced coordination capabilities:
                 openai_messages.insert(0, system_message)
                 
                 # Call OpenAI API
-                response = self.client.chat.completions.create(
+                response = await self.breakers["openai"].call(lambda: self.get_openai_client().chat.completions.create(
                     model="gpt-4o",  # Latest OpenAI model
                     messages=openai_messages,
                     temperature=0.7,
                     max_tokens=500
-                )
+                ))
                 
                 return response.choices[0].message.content
                 
+            except CircuitOpenError:
+                pass
             except Exception as e:
                 logger.error(f"OpenAI API error: {e}")
                 # Fall back to local response
@@ -246,15 +362,15 @@ You have access to advanced coordination capabilities:
     
     async def get_translation_for_family(self, text: str, language: str) -> str:
         """Translate care information for family members"""
-        if self.use_openai and self.client:
+        if self.use_openai and self.openai_api_key:
             try:
                 prompt = f"Translate this care-related information to {language} in a professional, clear manner: {text}"
-                response = self.client.chat.completions.create(
+                response = await self.breakers["openai"].call(lambda: self.get_openai_client().chat.completions.create(
                     model="gpt-4o",
                     messages=[{"role": "user", "content": prompt}],
                     temperature=0.7,
                     max_tokens=300
-                )
+                ))
                 return f"Translation for family coordination: {response.choices[0].message.content}"
             except Exception as e:
                 logger.error(f"Translation error: {e}")
@@ -263,9 +379,9 @@ You have access to advanced coordination capabilities:
             return f"I'll work on translating that care information to {language} for better family coordination."
     
     def test_genai_connection(self) -> bool:
-        """Test connection to GenAI network"""
+        """Test connection to GenAI network once, synchronously (the server uses probe_genai)"""
         try:
-            response = requests.get(f"{self.genai_backend_url}/health", timeout=5)
+            response = httpx.get(f"{self.genai_backend_url}/health", timeout=5)
             return response.status_code == 200
         except Exception as e:
             logger.error(f"GenAI connection test failed: {e}")
@@ -281,11 +397,11 @@ You have access to advanced coordination capabilities:
                 "max_tokens": 500
             }
             
-            response = requests.post(
+            response = await self.get_http_client().post(
                 f"{self.genai_backend_url}/v1/chat/completions",
                 json=payload,
                 headers={"Content-Type": "application/json"},
-                timeout=30
+                timeout=GENAI_TIMEOUT
             )
             
             if response.status_code == 200:
@@ -309,7 +425,7 @@ You have access to advanced coordination capabilities:
             try:
                 url = "http://api.weatherapi.com/v1/forecast.json"
                 params = {"q": city_name, "dt": date, "key": weather_api_key}
-                response = requests.get(url, params=params, timeout=10)
+                response = await self.get_http_client().get(url, params=params, timeout=WEATHER_TIMEOUT)
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -327,6 +443,16 @@ You have access to advanced coordination capabilities:
 app = FastAPI(title="Alex Agent", version="1.0.0")
 alex_agent = AlexAgent()
 
+@app.on_event("startup")
+async def startup():
+    """Open the shared HTTP connection pool"""
+    await alex_agent.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Close the shared HTTP connection pool"""
+    await alex_agent.close()
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -334,7 +460,15 @@ async def health_check():
         "status": "healthy", 
         "agent": "alex", 
         "genai_enabled": alex_agent.use_genai,
-        "openai_enabled": alex_agent.use_openai
+        "openai_enabled": alex_agent.use_openai,
+        "genai_probe": {
+            "ok": alex_agent.routing.probe_ok,
+            "latency_ms": alex_agent.routing.probe_latency_ms,
+            "checked_at": alex_agent.routing.probed_at,
+            "error": alex_agent.routing.probe_error,
+            "interval_s": GENAI_PROBE_INTERVAL
+        },
+        "circuit_breakers": {name: breaker.snapshot() for name, breaker in alex_agent.breakers.items()}
     }
 
 @app.get("/agent/info")
@@ -5,17 +5,21 @@ Standalone Grace Agent - Full AI Integration
 
 import os
 import json
+import hashlib
 import logging
 import asyncio
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Annotated
+from typing import Dict, List, Any, Optional, Annotated, NamedTuple
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 import uvicorn
+import httpx
 import openai
-from openai import OpenAI
-import requests
+from openai import AsyncOpenAI
 import nest_asyncio
+from circuit_breaker import CircuitBreaker, CircuitOpenError
 
 # GenAI session class (simplified for Docker deployment)
 class GenAISession:
@@ -34,6 +38,38 @@ nest_asyncio.apply()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Pooled HTTP connections shared by the GenAI, OpenAI and weather calls
+HTTP_MAX_CONNECTIONS = int(os.getenv('HTTP_MAX_CONNECTIONS', '100'))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('HTTP_MAX_KEEPALIVE_CONNECTIONS', '20'))
+# Per-request timeouts in seconds
+GENAI_TIMEOUT = float(os.getenv('GENAI_TIMEOUT', '30'))
+OPENAI_TIMEOUT = float(os.getenv('OPENAI_TIMEOUT', '60'))
+WEATHER_TIMEOUT = float(os.getenv('WEATHER_TIMEOUT', '10'))
+# GenAI backend health probe: seconds between probes and per-probe timeout
+GENAI_PROBE_INTERVAL = float(os.getenv('GENAI_PROBE_INTERVAL', '30'))
+GENAI_PROBE_TIMEOUT = float(os.getenv('GENAI_PROBE_TIMEOUT', '5'))
+
+class BackendRouting(NamedTuple):
+    """Backends used to answer, with the probe result they were decided from
+    
+    Replaced as a whole after each probe, so a request reading it once always
+    sees a consistent set of flags.
+    """
+    use_genai: bool
+    use_openai: bool
+    probe_ok: Optional[bool] = None
+    probe_latency_ms: Optional[float] = None
+    probed_at: Optional[str] = None
+    probe_error: Optional[str] = None
+
+# Latency-SLO mode: with GRACE_DEADLINE_MS > 0, an LLM answer not ready within
+# the deadline is replaced by the local reply and kept, for at most
+# GRACE_LATE_ANSWER_TTL seconds, to be given on the conversation's next turn.
+# Late answers are kept per client: requests must carry the OpenAI "user" field
+GRACE_DEADLINE_MS = float(os.getenv('GRACE_DEADLINE_MS', '0'))
+GRACE_LATE_ANSWER_TTL = float(os.getenv('GRACE_LATE_ANSWER_TTL', '900'))
+GRACE_LATE_ANSWERS_MAX = int(os.getenv('GRACE_LATE_ANSWERS_MAX', '1000'))
+
 # Request/Response models
 class ChatMessage(BaseModel):
     role: str
@@ -44,6 +80,8 @@ class ChatRequest(BaseModel):
     messages: List[ChatMessage]
     temperature: Optional[float] = 0.7
     max_tokens: Optional[int] = 500
+    # End-user or session identifier (OpenAI "user" field)
+    user: Optional[str] = None
 
 class ChatResponse(BaseModel):
     id: str
@@ -74,32 +112,129 @@ Your personality traits:
 
 When health concerns arise, gently suggest contacting family or medical professionals. Always prioritize their safety and wellbeing while maintaining your warm, caring demeanor."""
         
-        # Initialize GenAI network client first, then OpenAI as fallback
+        # GenAI network first, then OpenAI as fallback. The GenAI backend is
+        # probed in the background (see probe_loop); until the first probe
+        # answers, OpenAI is used when a key is available.
         self.genai_backend_url = os.getenv('GENAI_BACKEND_URL', 'http://genai-backend:8000')
-        self.use_genai = self.test_genai_connection()
+        self.openai_api_key = os.getenv('OPENAI_API_KEY')
+        self.routing = BackendRouting(use_genai=False, use_openai=bool(self.openai_api_key))
+        self.probe_task: Optional[asyncio.Task] = None
+        self.breakers = {"genai": CircuitBreaker("genai"), "openai": CircuitBreaker("openai")}
+        
+        # Deadline mode: late LLM answers by conversation key, their pending tasks, and counters
+        self.deadline_ms = GRACE_DEADLINE_MS
+        self.late_answers: "OrderedDict[str, tuple]" = OrderedDict()
+        self.late_tasks = set()
+        self.deadline_stats = {
+            "requests": 0,
+            "on_time": 0,
+            "deadline_hits": 0,
+            "late_answers_stored": 0,
+            "late_answers_delivered": 0
+        }
         
         # Log the configuration for debugging
         logger.info(f"GenAI Backend URL: {self.genai_backend_url}")
-        logger.info(f"GenAI Connection: {'enabled' if self.use_genai else 'disabled'}")
         
-        # Initialize OpenAI client as fallback
-        api_key = os.getenv('OPENAI_API_KEY')
-        if api_key and not self.use_genai:
-            self.client = OpenAI(api_key=api_key)
-            self.use_openai = True
-            logger.info("Grace Agent initialized with OpenAI API (GenAI not available)")
-        else:
-            self.client = None
-            self.use_openai = False
-            if self.use_genai:
-                logger.info("Grace Agent initialized with GenAI network")
-            else:
-                logger.info("Grace Agent initialized with local responses")
+        # Async HTTP and OpenAI clients, created on first use (or at app startup) and closed on shutdown
+        self.http_client: Optional[httpx.AsyncClient] = None
+        self.client: Optional[AsyncOpenAI] = None
         
         # Initialize GenAI session for advanced capabilities
         self.genai_session = None
         self.setup_genai_session()
     
+    def get_http_client(self) -> httpx.AsyncClient:
+        """Pooled async HTTP client shared by every request of this agent"""
+        if self.http_client is None or self.http_client.is_closed:
+            self.http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS
+                ),
+                timeout=GENAI_TIMEOUT
+            )
+            self.client = None
+        return self.http_client
+    
+    def get_openai_client(self) -> AsyncOpenAI:
+        """AsyncOpenAI client sending its requests through the shared pool"""
+        http_client = self.get_http_client()
+        if self.client is None:
+            self.client = AsyncOpenAI(api_key=self.openai_api_key, http_client=http_client, timeout=OPENAI_TIMEOUT)
+        return self.client
+    
+    @property
+    def use_genai(self) -> bool:
+        return self.routing.use_genai
+    
+    @property
+    def use_openai(self) -> bool:
+        return self.routing.use_openai
+    
+    async def probe_genai(self) -> BackendRouting:
+        """Check the GenAI backend health once and update the routing flags"""
+        started = asyncio.get_running_loop().time()
+        error = None
+        try:
+            response = await self.get_http_client().get(f"{self.genai_backend_url}/health", timeout=GENAI_PROBE_TIMEOUT)
+            healthy = response.status_code == 200
+            if not healthy:
+                error = f"HTTP {response.status_code}"
+        except Exception as e:
+            healthy = False
+            error = str(e) or type(e).__name__
+        latency_ms = round((asyncio.get_running_loop().time() - started) * 1000, 1)
+        
+        previous = self.routing
+        self.routing = BackendRouting(
+            use_genai=healthy,
+            use_openai=bool(self.openai_api_key) and not healthy,
+            probe_ok=healthy,
+            probe_latency_ms=latency_ms,
+            probed_at=datetime.now().isoformat(timespec="seconds"),
+            probe_error=error
+        )
+        if previous.probe_ok is None or previous.use_genai != healthy:
+            if healthy:
+                logger.info(f"Grace Agent using GenAI network ({latency_ms} ms)")
+            elif self.routing.use_openai:
+                logger.info(f"Grace Agent using OpenAI API (GenAI not available: {error})")
+            else:
+                logger.info(f"Grace Agent using local responses (GenAI not available: {error})")
+        return self.routing
+    
+    async def probe_loop(self):
+        """Probe the GenAI backend now and then every GENAI_PROBE_INTERVAL seconds"""
+        while True:
+            try:
+                await self.probe_genai()
+            except Exception as e:
+                logger.error(f"GenAI probe failed: {e}")
+            await asyncio.sleep(GENAI_PROBE_INTERVAL)
+    
+    async def start(self):
+        """Open the connection pool and start probing the GenAI backend in the background"""
+        self.get_http_client()
+        if self.probe_task is None or self.probe_task.done():
+            self.probe_task = asyncio.create_task(self.probe_loop())
+    
+    async def close(self):
+        """Stop probing, drop pending late answers and close the connection pool"""
+        for task in list(self.late_tasks):
+            task.cancel()
+        if self.probe_task is not None:
+            self.probe_task.cancel()
+            try:
+                await self.probe_task
+            except asyncio.CancelledError:
+                pass
+            self.probe_task = None
+        if self.http_client is not None:
+            await self.http_client.aclose()
+        self.http_client = None
+        self.client = None
+    
     def setup_genai_session(self):
         """Setup GenAI session for advanced capabilities"""
         try:
@@ -118,7 +253,7 @@ When health concerns arise, gently suggest contacting family or medical professi
             logger.error(f"Failed to initialize GenAI session: {e}")
             self.genai_session = None
     
-    async def generate_response(self, messages: List[ChatMessage]) -> str:
+    async def generate_response(self, messages: List[ChatMessage], session_id: Optional[str] = None) -> str:
         """Generate a response using GenAI network, OpenAI, or local fallback"""
         
         # Check if the message requests special capabilities
@@ -141,18 +276,30 @@ When health concerns arise, gently suggest contacting family or medical professi
             # Simple translation request handling
             return "I'd be happy to help you translate something, dear. What would you like me to translate and into which language?"
         
+        if self.deadline_ms > 0:
+            return await self.generate_deadline_response(messages, session_id)
+        return await self.generate_llm_response(messages)
+    
+    async def generate_llm_response(self, messages: List[ChatMessage]) -> str:
+        """Answer from the GenAI network, then OpenAI, then the local responder"""
+        
+        # Routing flags read once, so a probe finishing meanwhile cannot mix two states
+        routing = self.routing
+        
         # Try GenAI network first
-        if self.use_genai:
+        if routing.use_genai:
             try:
-                genai_response = await self.generate_genai_response(messages)
+                genai_response = await self.breakers["genai"].call(lambda: self.generate_genai_response(messages))
                 if genai_response:
                     return genai_response
+            except CircuitOpenError:
+                pass
             except Exception as e:
                 logger.error(f"GenAI network error: {e}")
                 # Fall through to OpenAI or local response
         
-        # Try OpenAI as fallback
-        if self.use_openai and self.client:
+        # Try OpenAI as fallback, also when the GenAI backend is up but did not answer
+        if routing.use_openai or (routing.use_genai and self.openai_api_key):
             try:
                 # Convert messages to OpenAI format
                 openai_messages = [{"role": msg.role, "content": msg.content} for msg in messages]
@@ -171,15 +318,17 @@ You also have access to helpful capabilities:
                 openai_messages.insert(0, system_message)
                 
                 # Call OpenAI API
-                response = self.client.chat.completions.create(
+                response = await self.breakers["openai"].call(lambda: self.get_openai_client().chat.completions.create(
                     model="gpt-4o",  # Latest OpenAI model
                     messages=openai_messages,
                     temperature=0.7,
                     max_tokens=500
-                )
+                ))
                 
                 return response.choices[0].message.content
                 
+            except CircuitOpenError:
+                pass
             except Exception as e:
                 logger.error(f"OpenAI API error: {e}")
                 # Fall back to local response
@@ -188,6 +337,94 @@ You also have access to helpful capabilities:
         # Final fallback to local response
         return self.generate_local_response(messages)
     
+    async def generate_deadline_response(self, messages: List[ChatMessage], session_id: Optional[str] = None) -> str:
+        """Answer within deadline_ms: the LLM reply if it is ready in time, the local reply otherwise
+        
+        With a session_id, the LLM keeps running after the deadline; its answer
+        is stored under the session and the conversation as it will look on the
+        next turn (these messages plus the reply sent now) and given at the
+        start of that turn's reply. Without one, two clients could send the
+        same history, so the late call is cancelled and the local reply stands.
+        """
+        self.deadline_stats["requests"] += 1
+        local_reply = self.generate_local_response(messages)
+        
+        # A late answer from the previous turn: the LLM sees it in place of the local reply it replaced
+        llm_messages = messages
+        late_answer = self.pop_late_answer(session_id, messages[:-1]) if session_id else None
+        if late_answer is not None:
+            llm_messages = messages[:-2] + [ChatMessage(role="assistant", content=late_answer), messages[-1]]
+        
+        llm_task = asyncio.create_task(self.generate_llm_response(llm_messages))
+        try:
+            reply = await asyncio.wait_for(asyncio.shield(llm_task), self.deadline_ms / 1000)
+            self.deadline_stats["on_time"] += 1
+        except asyncio.TimeoutError:
+            if llm_task.done() and not llm_task.cancelled() and llm_task.exception() is None:
+                # Finished just as the deadline fired: the answer is ready, give it now
+                self.deadline_stats["on_time"] += 1
+                reply = llm_task.result()
+            else:
+                self.deadline_stats["deadline_hits"] += 1
+                reply = local_reply
+        
+        if late_answer is not None:
+            reply = f"{late_answer}\n\n{reply}"
+        
+        if not llm_task.done():
+            if not session_id:
+                llm_task.cancel()
+                return reply
+            # Keyed on the history as the client will send it back, with the reply given now
+            key = self.conversation_key(session_id, messages + [ChatMessage(role="assistant", content=reply)])
+            self.late_tasks.add(llm_task)
+            llm_task.add_done_callback(lambda task: self.store_late_answer(key, task, local_reply))
+        return reply
+    
+    @staticmethod
+    def conversation_key(session_id: str, messages: List[ChatMessage]) -> str:
+        """Content address of one client's conversation history"""
+        history = json.dumps([session_id, [[msg.role, msg.content] for msg in messages]], ensure_ascii=False)
+        return hashlib.sha256(history.encode("utf-8")).hexdigest()
+    
+    def store_late_answer(self, key: str, task: asyncio.Task, local_reply: str):
+        """Keep the answer of an LLM call that missed its deadline for the next turn"""
+        self.late_tasks.discard(task)
+        if task.cancelled() or task.exception() is not None:
+            return
+        answer = task.result()
+        # Nothing to add when every backend failed and the LLM path fell back to the same local reply
+        if not answer or answer == local_reply:
+            return
+        self.late_answers[key] = (answer, time.monotonic())
+        self.late_answers.move_to_end(key)
+        while len(self.late_answers) > GRACE_LATE_ANSWERS_MAX:
+            self.late_answers.popitem(last=False)
+        self.deadline_stats["late_answers_stored"] += 1
+    
+    def pop_late_answer(self, session_id: str, history: List[ChatMessage]) -> Optional[str]:
+        """The stored late answer for a session's conversation whose last message is Grace's previous reply"""
+        if not history or history[-1].role != "assistant":
+            return None
+        stored = self.late_answers.pop(self.conversation_key(session_id, history), None)
+        if stored is None:
+            return None
+        answer, stored_at = stored
+        if time.monotonic() - stored_at > GRACE_LATE_ANSWER_TTL:
+            return None
+        self.deadline_stats["late_answers_delivered"] += 1
+        return answer
+    
+    def deadline_metrics(self) -> Dict[str, Any]:
+        stats = self.deadline_stats
+        return {
+            "deadline_ms": self.deadline_ms,
+            **stats,
+            "deadline_hit_rate": round(stats["deadline_hits"] / stats["requests"], 3) if stats["requests"] else 0.0,
+            "late_answers_pending": len(self.late_answers),
+            "llm_calls_running": len(self.late_tasks)
+        }
+    
     def generate_local_response(self, messages: List[ChatMessage]) -> str:
         """Generate local Grace-like response"""
         last_message = messages[-1].content.lower()
@@ -216,9 +453,9 @@ You also have access to helpful capabilities:
         return "I'm so glad you're sharing with me. You're very important, and I want you to know that I'm here to listen and help however I can. What would make you feel more comfortable or happy right now?"
     
     def test_genai_connection(self) -> bool:
-        """Test connection to GenAI network"""
+        """Test connection to GenAI network once, synchronously (the server uses probe_genai)"""
         try:
-            response = requests.get(f"{self.genai_backend_url}/health", timeout=5)
+            response = httpx.get(f"{self.genai_backend_url}/health", timeout=5)
             return response.status_code == 200
         except Exception as e:
             logger.error(f"GenAI connection test failed: {e}")
@@ -234,11 +471,11 @@ You also have access to helpful capabilities:
                 "max_tokens": 500
             }
             
-            response = requests.post(
+            response = await self.get_http_client().post(
                 f"{self.genai_backend_url}/v1/chat/completions",
                 json=payload,
                 headers={"Content-Type": "application/json"},
-                timeout=30
+                timeout=GENAI_TIMEOUT
             )
             
             if response.status_code == 200:
@@ -270,15 +507,15 @@ You also have access to helpful capabilities:
     
     async def get_translation(self, text: str, language: str) -> str:
         """Translate text for elderly users"""
-        if self.use_openai and self.client:
+        if self.use_openai and self.openai_api_key:
             try:
                 prompt = f"Translate this text to {language} in a gentle, caring way: {text}"
-                response = self.client.chat.completions.create(
+                response = await self.breakers["openai"].call(lambda: self.get_openai_client().chat.completions.create(
                     model="gpt-4o",
                     messages=[{"role": "user", "content": prompt}],
                     temperature=0.7,
                     max_tokens=200
-                )
+                ))
                 return f"Here's the translation for you, dear: {response.choices[0].message.content}"
             except Exception as e:
                 logger.error(f"Translation error: {e}")
@@ -296,7 +533,7 @@ You also have access to helpful capabilities:
             try:
                 url = "http://api.weatherapi.com/v1/forecast.json"
                 params = {"q": city_name, "dt": date, "key": weather_api_key}
-                response = requests.get(url, params=params, timeout=10)
+                response = await self.get_http_client().get(url, params=params, timeout=WEATHER_TIMEOUT)
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -314,6 +551,16 @@ You also have access to helpful capabilities:
 app = FastAPI(title="Grace Agent", version="1.0.0")
 grace_agent = GraceAgent()
 
+@app.on_event("startup")
+async def startup():
+    """Open the shared HTTP connection pool"""
+    await grace_agent.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Close the shared HTTP connection pool"""
+    await grace_agent.close()
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -321,9 +568,23 @@ async def health_check():
         "status": "healthy", 
         "agent": "grace", 
         "genai_enabled": grace_agent.use_genai,
-        "openai_enabled": grace_agent.use_openai
+        "openai_enabled": grace_agent.use_openai,
+        "genai_probe": {
+            "ok": grace_agent.routing.probe_ok,
+            "latency_ms": grace_agent.routing.probe_latency_ms,
+            "checked_at": grace_agent.routing.probed_at,
+            "error": grace_agent.routing.probe_error,
+            "interval_s": GENAI_PROBE_INTERVAL
+        },
+        "circuit_breakers": {name: breaker.snapshot() for name, breaker in grace_agent.breakers.items()},
+        "deadline": grace_agent.deadline_metrics()
     }
 
+@app.get("/metrics")
+async def metrics():
+    """Deadline mode counters, including the deadline hit rate"""
+    return grace_agent.deadline_metrics()
+
 @app.get("/agent/info")
 async def agent_info():
     """Get agent information"""
@@ -340,7 +601,7 @@ async def chat_completions(request: ChatRequest):
     """OpenAI-compatible chat completions endpoint with GenAI capabilities"""
     try:
         # Generate response (now async)
-        response_text = await grace_agent.generate_response(request.messages)
+        response_text = await grace_agent.generate_response(request.messages, request.user)
         
         # Format as OpenAI response
         response = ChatResponse(
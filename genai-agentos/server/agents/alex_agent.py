@@ -4,16 +4,16 @@ An intelligent and organized AI family planner designed to help younger family m
 stay connected with their elderly relatives.
 """
 
-import asyncio
 import json
 import time
 from typing import List, Dict, Any, Optional
 from genai_protocol.schemas import ChatRequest, ChatMessage, ChatResponse, ChatChoice
-from genai_protocol.handlers import BaseHandler
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
-import openai
 import os
+import sys
+sys.path.append('/app/shared')
+from agent_base import BaseAgent, close_shared_clients
 
 class AlexMemory:
     """Memory system for Alex agent"""
@@ -55,17 +55,16 @@ class AlexMemory:
             context += f"Action: {interaction['action_taken']}\n\n"
         return context
 
-class AlexAgent(BaseHandler):
+class AlexAgent(BaseAgent):
     """Alex - Family Coordinator AI Agent"""
     
+    temperature = 0.6
+    max_tokens = 500
+    
     def __init__(self):
-        super().__init__()
+        super().__init__("Alex", "family_coordinator")
+        # Alex keeps its own coordination memory instead of the base agent's
         self.memory = AlexMemory()
-        self.openai_client = None
-        
-        # Initialize OpenAI client if API key is available
-        if os.getenv("OPENAI_API_KEY"):
-            self.openai_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         
         self.personality = {
             "name": "Alex",
@@ -132,6 +131,14 @@ Remember to:
 - Balance the needs of all family members
 - Maintain privacy and discretion in family matters"""
 
+    def get_system_prompt(self) -> str:
+        """Get Alex's system prompt"""
+        return self.system_prompt
+    
+    def get_fallback_response(self, user_message: str) -> str:
+        """Get fallback response when OpenAI is not available"""
+        return self._generate_local_response(user_message)
+    
     async def handle_chat_request(self, chat_request: ChatRequest) -> ChatResponse:
         """Handle incoming chat requests"""
         try:
@@ -203,7 +210,7 @@ Remember to:
         """Generate response using OpenAI or local logic"""
         
         # Try OpenAI first if available
-        if self.openai_client:
+        if self.openai_api_key:
             try:
                 context = self.memory.get_context()
                 
@@ -219,17 +226,7 @@ Remember to:
                         "content": msg.content
                     })
                 
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.openai_client.chat.completions.create(
-                        model="gpt-4o",
-                        messages=messages,
-                        temperature=0.6,
-                        max_tokens=500
-                    )
-                )
-                
-                return response.choices[0].message.content
+                return await self._chat_completion(messages)
                 
             except Exception as e:
                 print(f"OpenAI error: {e}")
@@ -290,6 +287,11 @@ Remember to:
 app = FastAPI(title="Alex Agent", description="Family Coordinator AI Agent")
 alex_agent = AlexAgent()
 
+@app.on_event("shutdown")
+async def close_connections():
+    """Close the shared OpenAI connection pool"""
+    await close_shared_clients()
+
 @app.post("/v1/chat/completions")
 async def chat_completion(request: ChatRequest):
     """OpenAI-compatible chat completion endpoint"""
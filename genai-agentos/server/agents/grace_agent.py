@@ -9,10 +9,11 @@ import time
 from typing import List, Dict, Any, Optional
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
+from genai_protocol.schemas import ChatRequest
 import os
 import sys
 sys.path.append('/app/shared')
-from agent_base import BaseAgent
+from agent_base import BaseAgent, close_shared_clients
 
 class GraceMemory:
     """Memory system for Grace agent"""
@@ -141,13 +142,11 @@ Remember to:
         """Generate response using OpenAI or local logic"""
         
         # Try OpenAI first if available
-        if self.openai_client:
+        if self.openai_api_key:
             try:
-                context = self.memory.get_context()
-                
                 messages = [
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "system", "content": context}
+                    {"role": "system", "content": self.get_system_prompt()},
+                    {"role": "system", "content": self.get_memory_context()}
                 ]
                 
                 # Add conversation history
@@ -157,17 +156,7 @@ Remember to:
                         "content": msg.content
                     })
                 
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.openai_client.chat.completions.create(
-                        model="gpt-4o",
-                        messages=messages,
-                        temperature=0.7,
-                        max_tokens=400
-                    )
-                )
-                
-                return response.choices[0].message.content
+                return await self._chat_completion(messages)
                 
             except Exception as e:
                 print(f"OpenAI error: {e}")
@@ -221,6 +210,11 @@ Remember to:
 app = FastAPI(title="Grace Agent", description="Elderly Companion AI Agent")
 grace_agent = GraceAgent()
 
+@app.on_event("shutdown")
+async def close_connections():
+    """Close the shared OpenAI connection pool"""
+    await close_shared_clients()
+
 @app.post("/v1/chat/completions")
 async def chat_completion(request: ChatRequest):
     """OpenAI-compatible chat completion endpoint"""
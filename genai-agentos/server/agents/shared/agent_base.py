@@ -5,24 +5,86 @@ Base agent functionality shared between Grace and Alex agents
 import os
 import json
 import asyncio
+import weakref
 from typing import Dict, Any, List, Optional
 from abc import ABC, abstractmethod
 from genai_protocol.schemas import ChatRequest, ChatMessage, ChatResponse, ChatChoice
 from genai_protocol.handlers import BaseHandler
+import httpx
 import openai
+from response_cache import ResponseCache, make_cache_key
+
+# Connection pool shared by every agent of the process. httpx connections are
+# bound to the event loop that opened them, so pools are keyed by loop (one per
+# process under uvicorn) and dropped when the loop is garbage collected.
+# Same helpers as agents/base_agent.py of the main app: these agents are built
+# from their own Docker context and cannot import it.
+MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "200"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "50"))
+REQUEST_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+# OpenAI requests an agent runs at once; further requests wait for a free slot
+MAX_IN_FLIGHT = int(os.getenv("AGENT_MAX_IN_FLIGHT", "64"))
+
+_http_clients = weakref.WeakKeyDictionary()
+_openai_clients = weakref.WeakKeyDictionary()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the pooled httpx client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            timeout=REQUEST_TIMEOUT,
+        )
+        _http_clients[loop] = client
+    return client
+
+
+def get_async_openai_client(api_key: str) -> openai.AsyncOpenAI:
+    """Return an AsyncOpenAI client for api_key that uses the shared connection pool"""
+    loop = asyncio.get_running_loop()
+    http_client = get_http_client()
+    clients = _openai_clients.setdefault(loop, {})
+    key = (api_key, id(http_client))
+    client = clients.get(key)
+    if client is None:
+        client = openai.AsyncOpenAI(api_key=api_key, http_client=http_client)
+        clients[key] = client
+    return client
+
+
+async def close_shared_clients():
+    """Close the connection pool of the running event loop"""
+    loop = asyncio.get_running_loop()
+    _openai_clients.pop(loop, None)
+    client = _http_clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
 
 class BaseAgent(BaseHandler, ABC):
     """Base class for all FamilyConnect agents"""
     
-    def __init__(self, agent_name: str, agent_role: str):
+    model = "gpt-4o"
+    temperature = 0.7
+    max_tokens = 400
+    
+    def __init__(self, agent_name: str, agent_role: str, response_cache: Optional[ResponseCache] = None,
+                 max_in_flight: int = MAX_IN_FLIGHT):
         super().__init__()
         self.agent_name = agent_name
         self.agent_role = agent_role
-        self.openai_client = None
-        
-        # Initialize OpenAI client if API key is available
-        if os.getenv("OPENAI_API_KEY"):
-            self.openai_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # OpenAI is used when an API key is available; the client itself is shared (see get_async_openai_client)
+        self.openai_api_key = os.getenv("OPENAI_API_KEY")
+        # Opt-in cache answering identical OpenAI requests without a network call
+        self.response_cache = response_cache
+        self.max_in_flight = max_in_flight
+        self._in_flight = asyncio.Semaphore(max_in_flight)
         
         self.conversation_history: List[Dict[str, Any]] = []
         self.memory: Dict[str, Any] = {
@@ -67,9 +129,16 @@ class BaseAgent(BaseHandler, ABC):
         """Get fallback response when OpenAI is not available"""
         pass
     
+    @property
+    def openai_client(self) -> Optional[openai.AsyncOpenAI]:
+        """Shared AsyncOpenAI client of the running loop, or None without an API key"""
+        if not self.openai_api_key:
+            return None
+        return get_async_openai_client(self.openai_api_key)
+    
     async def generate_response(self, user_message: str, context: Dict[str, Any] = None) -> str:
         """Generate response using OpenAI or fallback"""
-        if self.openai_client:
+        if self.openai_api_key:
             try:
                 return await self._generate_openai_response(user_message, context)
             except Exception as e:
@@ -93,17 +162,37 @@ class BaseAgent(BaseHandler, ABC):
         
         messages.append({"role": "user", "content": user_message})
         
-        response = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=messages,
-                temperature=0.7,
-                max_tokens=400
-            )
-        )
+        return await self._chat_completion(messages)
+    
+    async def _chat_completion(self, messages: List[Dict[str, str]], **overrides) -> str:
+        """Send messages to OpenAI and return the reply text
+        
+        Answers come from the response cache when possible. Otherwise the call
+        goes through the shared async client, with at most max_in_flight
+        requests of this agent running at once.
+        """
+        params = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            **overrides
+        }
+        
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = make_cache_key(params)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        async with self._in_flight:
+            response = await self.openai_client.chat.completions.create(**params)
         
-        return response.choices[0].message.content
+        content = response.choices[0].message.content
+        if cache_key is not None and content:
+            self.response_cache.set(cache_key, content)
+        return content
     
     async def handle_chat_request(self, chat_request: ChatRequest) -> ChatResponse:
         """Handle incoming chat requests"""
@@ -0,0 +1,156 @@
+"""
+Microbenchmark du routage des requêtes de main_agent.
+
+Compare l'ancienne chaîne de tests `in` + re.search (recopiée ci-dessous) avec
+le routeur précompilé agents.intent_router sur un corpus de requêtes
+représentatives : temps moyen par requête, nombre de requêtes envoyées à
+query_chatgpt faute d'intention reconnue, intentions et paramètres (phrase à
+traduire, ville) corrects. Le script sort en erreur si le routeur précompilé
+se trompe sur une requête du corpus.
+
+Le routeur précompilé est plus lent que les anciens tests `in` (quelques µs
+par requête contre environ 1 µs) : il normalise le texte et essaie toutes les
+intentions à chaque position. Ce coût reste très loin d'un appel à GPT ; le
+gain recherché est la justesse du routage, pas la vitesse.
+
+Usage : python scripts/bench_intent_router.py [--repeat 2000]
+"""
+
+import argparse
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.intent_router import dispatch  # noqa: E402
+
+# (requête, intention attendue, paramètres attendus)
+CORPUS = [
+    ("traduit Bonjour, comment ça va ?", "translate", {"sentence": "Bonjour, comment ça va ?"}),
+    ("Traduis je suis content de te voir", "translate", {"sentence": "je suis content de te voir"}),
+    ("peux-tu traduire merci beaucoup", "translate", {"sentence": "merci beaucoup"}),
+    ("traduction de bon anniversaire", "translate", {"sentence": "bon anniversaire"}),
+    ("TRADUIRE il fait beau aujourd'hui", "translate", {"sentence": "il fait beau aujourd'hui"}),
+    ("Résumer de ce texte : la réunion est reportée à jeudi", "summarize", {}),
+    ("resumer ce document sur la retraite", "summarize", {}),
+    ("Résume-moi l'article sur la santé", "summarize", {}),
+    ("quelles sont les dates anniversaires ce mois-ci ?", "birthdays", {}),
+    ("c'est quand l'anniversaire de Sarah ?", "birthdays", {}),
+    ("Dates d'anniversaires de la famille", "birthdays", {}),
+    ("quels anniversaires arrivent bientôt ?", "birthdays", {}),
+    ("les anniversaires à venir", "birthdays", {}),
+    ("quels sont mes rendez-vous ?", "appointments", {}),
+    ("j'ai un rendez vous chez le médecin ?", "appointments", {}),
+    ("Mon prochain RDV santé", "appointments", {}),
+    ("qu'y a-t-il dans mon agenda cette semaine ?", "appointments", {}),
+    ("météo de Paris", "weather", {"city": "Paris"}),
+    ("Quelle est la meteo de Lyon ?", "weather", {"city": "Lyon"}),
+    ("quel temps fait-il à Bordeaux ?", "weather", {"city": "Bordeaux"}),
+    ("le temps à Marseille", "weather", {"city": "Marseille"}),
+    ("il fait à Toulouse combien de degrés", "weather", {"city": "Toulouse"}),
+    ("Météo à Saint-Étienne", "weather", {"city": "Saint-Étienne"}),
+    ("météo de Paris demain", "weather", {"city": "Paris"}),
+    ("il fait froid à Lyon ce soir ?", "weather", {"city": "Lyon"}),
+    ("météo de la semaine à Nice", "weather", {"city": "Nice"}),
+    ("quel temps fera-t-il au Havre ce week-end ?", "weather", {"city": "Havre"}),
+    ("joue de la musique", "music", {}),
+    ("une chanson douce s'il te plaît", "music", {}),
+    ("crée une musique joyeuse", "music", {}),
+    ("lis le fichier des notes", "files", {}),
+    ("que dit la documentation ?", "files", {}),
+    ("cherche dans les documents", "files", {}),
+    ("quel jour sommes-nous ?", "date_time", {}),
+    ("Quelle heure est-il ?", "date_time", {}),
+    ("quelle date on est aujourd'hui", "date_time", {}),
+    ("Bonjour, comment vas-tu ?", "chat", {}),
+    ("raconte-moi une histoire", "chat", {}),
+    ("qui était le président en 1970 ?", "chat", {}),
+    ("donne-moi une recette de gâteau", "chat", {}),
+    ("je me sens un peu seul aujourd'hui", "chat", {}),
+    ("Je n'ai pas le temps de cuisiner", "chat", {}),
+    ("Qu'est-ce qu'il fait mon petit-fils ?", "chat", {}),
+    ("bon anniversaire mamie !", "chat", {}),
+    ("je prépare un gâteau d'anniversaire", "chat", {}),
+]
+
+
+def legacy_route(query):
+    """Ancienne logique de main_agent : intention et paramètres qu'elle transmettait."""
+    if "traduit" in query or "traduire" in query or "traduction" in query:
+        match = re.search(r"traduit (.+)", query)
+        if not match:
+            match = re.search(r"traduire (.+)", query)
+            if not match:
+                match = re.search(r"traduction de (.+)", query)
+        return "translate", {"sentence": match.group(1)} if match else {}
+    elif "résumer" in query:
+        re.search(r"résumer de (\w+)", query)
+        return "summarize", {}
+    elif "dates anniversaires" in query:
+        return "birthdays", {}
+    elif "rendez-vous" in query:
+        return "appointments", {}
+    elif "météo" in query or "le temps à" in query or "il fait à" in query:
+        match = re.search(r"météo de (\w+)", query)
+        if not match:
+            match = re.search(r"le temps à (.+)", query)
+            if not match:
+                match = re.search(r"il fait à (.+)", query)
+        return "weather", {"city": match.group(1)} if match else {}
+    elif "musique" in query:
+        return "music", {}
+    elif "fichier" in query or "document" in query or "documentation" in query:
+        return "files", {}
+    return "chat", {}
+
+
+def compiled_route(query):
+    intent = dispatch(query)
+    return intent.name, intent.slots
+
+
+def evaluate(router):
+    """(requêtes envoyées à GPT, requêtes de chat attendues, intentions correctes, paramètres corrects, erreurs)"""
+    expected_chat = sum(1 for _, intent, _ in CORPUS if intent == "chat")
+    fall_through = correct = correct_slots = 0
+    mistakes = []
+    for query, intent, slots in CORPUS:
+        name, found = router(query)
+        fall_through += name == "chat"
+        correct += name == intent
+        correct_slots += name == intent and found == slots
+        if name != intent or found != slots:
+            mistakes.append((query, intent, slots, name, found))
+    return fall_through, expected_chat, correct, correct_slots, mistakes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000, help="passes over the corpus")
+    parser.add_argument("--verbose", action="store_true", help="list the queries each router gets wrong")
+    args = parser.parse_args()
+
+    print(f"Corpus: {len(CORPUS)} requêtes, {args.repeat} passes\n")
+    print(f"{'routeur':<12}{'µs/requête':>12}{'vers GPT':>10}{'attendu':>9}{'intentions':>12}{'paramètres':>12}")
+    failed = False
+    for name, router in (("legacy", legacy_route), ("compiled", compiled_route)):
+        elapsed = timeit.timeit(lambda: [router(query) for query, _, _ in CORPUS], number=args.repeat)
+        per_query = elapsed / (args.repeat * len(CORPUS)) * 1e6
+        fall_through, expected_chat, correct, correct_slots, mistakes = evaluate(router)
+        print(f"{name:<12}{per_query:>12.2f}{fall_through:>10}{expected_chat:>9}"
+              f"{correct:>9}/{len(CORPUS)}{correct_slots:>9}/{len(CORPUS)}")
+        if name == "compiled":
+            failed = bool(mistakes)
+        if mistakes and (args.verbose or name == "compiled"):
+            for query, intent, slots, found_intent, found_slots in mistakes:
+                print(f"    {query!r}: attendu {intent} {slots}, obtenu {found_intent} {found_slots}")
+
+    # Le corpus sert aussi de test de non-régression du routeur précompilé
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Budget de temps d'import au démarrage.
+
+Pour chaque module cible, lance un interpréteur neuf avec `python -X importtime`,
+relève le temps cumulé de l'import et liste les modules les plus coûteux.
+Avec --budget, le script sort en erreur si une cible dépasse le budget (en ms),
+ce qui permet de l'utiliser comme garde-fou contre les imports lourds
+(openai, transformers, requests...) qui reviendraient au chargement.
+Une cible qui ne s'importe pas fait toujours sortir le script en erreur : son
+temps, interrompu à l'échec, ne dit rien du démarrage réel.
+
+Usage : python scripts/bench_startup.py [--budget 300] [--top 10] [module ...]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TARGETS = ["app", "agents.main_agent", "main", "app_agent", "app_birthday"]
+
+# Ligne produite par -X importtime : "import time:   self [us] | cumulative | module"
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module):
+    """(temps cumulé en ms, [(ms cumulées, module)], erreur ou None) pour l'import de module"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    imports = []
+    errors = []
+    for line in result.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            imports.append((int(match.group(2)) / 1000, match.group(4), len(match.group(3))))
+        elif line.strip():
+            errors.append(line)
+    error = None
+    if result.returncode != 0:
+        error = errors[-1] if errors else f"code de sortie {result.returncode}"
+    # Les imports de premier niveau (indentation minimale) se partagent le total
+    top_level = min((indent for _, _, indent in imports), default=0)
+    total = sum(ms for ms, _, indent in imports if indent == top_level)
+    return total, sorted(((ms, name) for ms, name, _ in imports), reverse=True), error
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_TARGETS, help="modules to import")
+    parser.add_argument("--budget", type=float, help="maximum import time per module, in ms")
+    parser.add_argument("--top", type=int, default=10, help="slowest modules listed per target")
+    args = parser.parse_args()
+
+    over_budget = []
+    failed = []
+    for module in args.modules:
+        total, imports, error = measure(module)
+        status = ""
+        if error:
+            status = "  ÉCHEC"
+            failed.append(module)
+        elif args.budget is not None and total > args.budget:
+            status = f"  > budget {args.budget:.0f} ms"
+            over_budget.append(module)
+        print(f"{module}: {total:.1f} ms{status}")
+        if error:
+            # Typiquement une dépendance absente : le temps mesuré s'arrête à l'échec
+            print(f"  import interrompu : {error}")
+        for ms, name in imports[:args.top]:
+            print(f"  {ms:>9.1f} ms  {name}")
+        print()
+
+    if failed:
+        print(f"Import impossible : {', '.join(failed)}")
+    if over_budget:
+        print(f"Budget dépassé : {', '.join(over_budget)}")
+    if failed or over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+// Progressive rendering of /query answers.
+//
+// Posts the query to /query/stream and appends each Server-Sent Event token
+// to the target element as soon as it arrives, so the first words show up
+// while GPT is still writing the rest. Falls back to /query when streaming
+// is not available.
+//
+// Usage in templates/index.html:
+//   <script src="{{ url_for('static', filename='js/query-stream.js') }}"></script>
+//   streamQuery(userQuery, document.getElementById('response'));
+
+async function streamQuery(query, target) {
+  target.textContent = '';
+
+  let response;
+  try {
+    response = await fetch('/query/stream', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+      body: JSON.stringify({ query: query }),
+    });
+  } catch (error) {
+    response = null;
+  }
+
+  if (!response || !response.ok || !response.body) {
+    const fallback = await fetch('/query', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ query: query }),
+    });
+    const data = await fallback.json();
+    target.textContent = typeof data.response === 'string' ? data.response : JSON.stringify(data.response);
+    return target.textContent;
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    // Events are separated by a blank line
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const rawEvent = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+
+      let eventName = 'message';
+      let payload = '';
+      for (const line of rawEvent.split('\n')) {
+        if (line.startsWith('event:')) eventName = line.slice(6).trim();
+        else if (line.startsWith('data:')) payload += line.slice(5).trim();
+      }
+
+      if (eventName === 'done') return target.textContent;
+      if (payload) target.textContent += JSON.parse(payload).token;
+    }
+  }
+  return target.textContent;
+}
@@ -0,0 +1,107 @@
+import asyncio
+import json
+from datetime import date, datetime, time, timedelta
+
+from agents.birthday_scheduler import AlertLedger, BirthdayScheduler
+from agents.memory_agent import MemoryAgent
+
+
+# A birthday two days ahead, recent enough that the ledger never prunes it
+DAY = date.today() + timedelta(days=2)
+
+
+class FlakyMaster:
+    """Master agent whose first failures alerts raise"""
+
+    def __init__(self, failures=0, delay=0.0):
+        self.failures = failures
+        self.delay = delay
+        self.sent = []
+
+    async def handle_birthday_alert(self, birthday):
+        await asyncio.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("master unavailable")
+        self.sent.append(birthday["name"])
+
+
+def make_agent(tmp_path, master, day=DAY):
+    birthdays = {"birthdays": [{"name": "Sarah", "date": day.replace(year=1952).isoformat()}]}
+    data_path = tmp_path / "birthdays.json"
+    data_path.write_text(json.dumps(birthdays))
+    agent = MemoryAgent("test-key", data_file_path=str(data_path), ledger_path=str(tmp_path / "ledger.json"))
+    agent.register_master_agent(master)
+
+    async def analyze_birthdays(birthdays, day):
+        return birthdays
+
+    async def get_daily_analysis(day=None):
+        return agent.birthday_store.on_date(date.today())
+
+    agent.analyze_birthdays = analyze_birthdays
+    agent.get_daily_analysis = get_daily_analysis
+    return agent
+
+
+def test_failed_alert_is_retried_with_backoff(tmp_path):
+    master = FlakyMaster(failures=2)
+    agent = make_agent(tmp_path, master)
+    scheduler = BirthdayScheduler(agent, retry_delay=60, max_retry_delay=100)
+    now = datetime.combine(DAY, time(9, 30))
+
+    asyncio.run(scheduler.run_once(now))
+    assert master.sent == []
+    assert scheduler.seconds_until_next(now) == 60
+    # Not due yet: nothing is sent before the backoff expires
+    asyncio.run(scheduler.run_once(now + timedelta(seconds=30)))
+    assert master.failures == 1
+
+    asyncio.run(scheduler.run_once(now + timedelta(seconds=60)))
+    assert master.failures == 0 and master.sent == []
+    # The second failure doubles the delay
+    assert scheduler.seconds_until_next(now + timedelta(seconds=60)) == 100
+
+    asyncio.run(scheduler.run_once(now + timedelta(seconds=160)))
+    assert master.sent == ["Sarah"]
+    assert agent.alert_ledger.contains("Sarah", DAY)
+    asyncio.run(scheduler.run_once(now + timedelta(seconds=3600)))
+    assert master.sent == ["Sarah"]
+
+
+def test_manual_trigger_goes_through_the_ledger(tmp_path):
+    master = FlakyMaster()
+    agent = make_agent(tmp_path, master, date.today())
+    asyncio.run(agent.check_and_alert())
+    asyncio.run(agent.check_and_alert())
+    assert master.sent == ["Sarah"]
+
+    scheduler = BirthdayScheduler(agent)
+    asyncio.run(scheduler.run_once(datetime.combine(date.today(), time(9, 30))))
+    assert master.sent == ["Sarah"]
+
+
+def test_concurrent_senders_alert_once(tmp_path):
+    master = FlakyMaster(delay=0.05)
+    agent = make_agent(tmp_path, master)
+    birthday = {"name": "Sarah"}
+
+    async def both():
+        return await asyncio.gather(agent.send_alerts([birthday], DAY),
+                                    agent.send_alerts([birthday], DAY))
+
+    results = asyncio.run(both())
+    assert sorted(results, key=str) == [[None], [True]]
+    assert master.sent == ["Sarah"]
+
+
+def test_failed_claim_is_released(tmp_path):
+    ledger = AlertLedger(str(tmp_path / "ledger.json"))
+    day = DAY
+    assert ledger.claim("Sarah", day)
+    assert not ledger.claim("Sarah", day)
+    ledger.release("Sarah", day, sent=False)
+    assert ledger.claim("Sarah", day)
+    ledger.release("Sarah", day, sent=True)
+    assert not ledger.claim("Sarah", day)
+    assert AlertLedger(str(tmp_path / "ledger.json")).contains("Sarah", day)
@@ -0,0 +1,68 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from agents.calendar_store import CalendarStore
+
+NOW = datetime(2025, 7, 28, 9, 0)  # a Monday
+
+APPOINTMENTS = [
+    {"titre": "Promenade en famille", "type": "Famille", "date": "2025-07-28 10:00:00"},
+    {"titre": "Match de foot", "type": "Sport", "date": "2025-07-29 14:00:00"},
+    {"titre": "Kiné", "type": "Santé", "date": "2025-08-06 10:50:00"},
+    {"titre": "Généraliste", "type": "Médecin", "date": "2025-08-01 09:00:00"},
+    {"titre": "Cardiologue", "type": "Santé", "date": "2025-07-30 11:00:00"},
+    {"titre": "Ancien rendez-vous", "type": "Santé", "date": "2025-07-01 11:00:00"},
+    {"titre": "Sans date", "type": "Social", "date": "bientôt"},
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / "calendar.json"
+    path.write_text(json.dumps(APPOINTMENTS))
+    return CalendarStore(str(path))
+
+
+@pytest.mark.parametrize("query", [
+    "Est-ce que je dois annuler mon rendez-vous avec le cardiologue ?",
+    "Qu'est-ce que je dois apporter à mon rendez-vous chez le dentiste ?",
+    "J'ai un rendez-vous chez le médecin ?",
+    "Je suis fatiguée après mes rendez-vous",
+])
+def test_questions_that_are_not_listings_go_to_gpt(store, query):
+    assert store.answer(query, NOW) is None
+
+
+def test_next_appointment_of_a_type(store):
+    assert store.answer("Quand est mon prochain rendez-vous de sport ?", NOW) == \
+        "Votre prochain rendez-vous Sport : Match de foot le mardi 29 juillet 2025 à 14h00."
+
+
+def test_medecin_type_and_synonym_are_both_searched(store):
+    answer = store.answer("Quels sont mes rendez-vous chez le médecin ?", NOW)
+    assert answer.splitlines() == [
+        "Vos rendez-vous Médecin ou Santé à venir :",
+        "- Cardiologue le mercredi 30 juillet 2025 à 11h00",
+        "- Généraliste le vendredi 1 août 2025 à 09h00",
+        "- Kiné le mercredi 6 août 2025 à 10h50",
+    ]
+    assert store.answer("prochain rdv chez le docteur", NOW).startswith("Votre prochain rendez-vous Santé : Cardiologue")
+
+
+def test_period_listing(store):
+    assert store.answer("Qu'ai-je de prévu cette semaine ?", NOW).splitlines() == [
+        "Vos rendez-vous cette semaine :",
+        "- Promenade en famille le lundi 28 juillet 2025 à 10h00",
+        "- Match de foot le mardi 29 juillet 2025 à 14h00",
+        "- Cardiologue le mercredi 30 juillet 2025 à 11h00",
+        "- Généraliste le vendredi 1 août 2025 à 09h00",
+    ]
+    assert store.answer("mes rendez-vous demain", NOW) == \
+        "Vos rendez-vous demain :\n- Match de foot le mardi 29 juillet 2025 à 14h00"
+
+
+def test_no_match(store):
+    assert store.answer("Quels rendez-vous de sport la semaine prochaine ?", NOW) == \
+        "Aucun rendez-vous Sport la semaine prochaine."
@@ -0,0 +1,158 @@
+import asyncio
+import importlib.util
+import os
+
+import pytest
+
+BREAKER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            "familyconnect-agents", "circuit_breaker.py")
+
+
+def load_breaker_module():
+    # familyconnect-agents is not a package: load the module from its file
+    spec = importlib.util.spec_from_file_location("circuit_breaker", BREAKER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+breaker_module = load_breaker_module()
+
+
+def make_breaker(**overrides):
+    settings = dict(window=4, min_calls=4, error_rate=0.5, slow_call_seconds=1.0, slow_rate=0.5, open_seconds=30)
+    settings.update(overrides)
+    return breaker_module.CircuitBreaker("test", **settings)
+
+
+def expire(breaker):
+    breaker.opened_at -= breaker.open_seconds
+
+
+def call(breaker, success, seconds=0.1):
+    ticket = breaker.allow()
+    assert ticket is not None
+    breaker.record(ticket, success, seconds)
+
+
+def open_breaker(breaker):
+    for _ in range(breaker.min_calls):
+        call(breaker, False)
+    assert breaker.state == "open"
+
+
+def test_opens_on_error_rate_once_enough_calls_are_seen():
+    breaker = make_breaker()
+    for success in (False, False, True):
+        call(breaker, success)
+    assert breaker.state == "closed"
+    call(breaker, True)
+    assert breaker.state == "open"
+    assert breaker.allow() is None
+    assert breaker.rejected == 1
+    assert breaker.times_opened == 1
+
+
+def test_opens_on_slow_calls():
+    breaker = make_breaker()
+    for seconds in (2.0, 2.0, 0.1, 0.1):
+        call(breaker, True, seconds)
+    assert breaker.state == "open"
+
+
+def test_half_open_lets_a_single_trial_through():
+    breaker = make_breaker()
+    open_breaker(breaker)
+    expire(breaker)
+    trial = breaker.allow()
+    assert trial is not None
+    assert breaker.state == "half_open"
+    assert breaker.allow() is None
+    breaker.record(trial, True, 0.1)
+    assert breaker.state == "closed"
+    assert breaker.allow() is not None
+
+
+def test_failed_or_slow_trial_reopens():
+    breaker = make_breaker()
+    open_breaker(breaker)
+    for outcome in ((False, 0.1), (True, 2.0)):
+        expire(breaker)
+        call(breaker, *outcome)
+        assert breaker.state == "open"
+    assert breaker.times_opened == 3
+
+
+def test_stale_call_does_not_settle_the_trial():
+    breaker = make_breaker()
+    stale = breaker.allow()
+    open_breaker(breaker)
+    expire(breaker)
+    trial = breaker.allow()
+    # A call started before the breaker opened finishes while the trial runs
+    breaker.record(stale, True, 0.1)
+    assert breaker.state == "half_open"
+    assert breaker.allow() is None
+    breaker.record(stale, False, 0.1)
+    assert breaker.state == "half_open"
+    breaker.record(trial, False, 0.1)
+    assert breaker.state == "open"
+
+
+def test_call_counts_none_and_exceptions_as_failures():
+    breaker = make_breaker(window=2, min_calls=2, error_rate=1.0)
+
+    async def empty():
+        return None
+
+    async def broken():
+        raise ValueError("backend down")
+
+    assert asyncio.run(breaker.call(empty)) is None
+    with pytest.raises(ValueError):
+        asyncio.run(breaker.call(broken))
+    assert breaker.state == "open"
+    with pytest.raises(breaker_module.CircuitOpenError):
+        asyncio.run(breaker.call(empty))
+
+
+def test_cancelled_trial_frees_the_slot_without_recording():
+    breaker = make_breaker()
+    open_breaker(breaker)
+    expire(breaker)
+
+    async def cancelled():
+        raise asyncio.CancelledError()
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(breaker.call(cancelled))
+    assert breaker.state == "half_open"
+    assert breaker.allow() is not None
+
+
+def test_cancelled_stale_call_keeps_the_trial_slot():
+    breaker = make_breaker()
+
+    async def scenario():
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def hanging():
+            started.set()
+            await release.wait()
+            return "late"
+
+        stale = asyncio.create_task(breaker.call(hanging))
+        await started.wait()
+        open_breaker(breaker)
+        expire(breaker)
+        trial = breaker.allow()
+        stale.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await stale
+        # The trial is still running: nobody else may go through
+        assert breaker.allow() is None
+        breaker.record(trial, True, 0.1)
+        assert breaker.state == "closed"
+
+    asyncio.run(scenario())
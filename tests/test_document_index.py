@@ -0,0 +1,63 @@
+import os
+
+from agents.document_index import DocumentIndex, split_chunks, tokenize
+
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    # Make sure the index sees a new signature even within the same mtime tick
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_tokenize_folds_accents_case_and_plurals():
+    assert tokenize("Météo des Anniversaires") == ["meteo", "des", "anniversaire"]
+
+
+def test_split_chunks_respects_the_chunk_size():
+    text = "\n".join(f"ligne {i} " + "mot " * 10 for i in range(40))
+    chunks = split_chunks(text, chunk_tokens=32)
+    assert len(chunks) > 1
+    assert "\n".join(chunks).split() == text.split()
+    long_line = "mot " * 500
+    assert all(len(chunk) // 4 + 1 <= 64 for chunk in split_chunks(long_line, chunk_tokens=32))
+
+
+def test_search_ranks_matching_chunks_first(tmp_path):
+    write(tmp_path / "calendar.json", '{"events": [{"name": "Dentiste", "date": "2026-03-01"}]}')
+    write(tmp_path / "notes.txt", "Acheter du pain\nAppeler le plombier")
+    index = DocumentIndex([str(tmp_path)])
+    assert index.refresh() == 2
+    results = index.search("rendez-vous dentiste")
+    assert [os.path.basename(chunk.path) for _, chunk in results] == ["calendar.json"]
+    # File names are indexed too
+    assert os.path.basename(index.search("calendar")[0][1].path) == "calendar.json"
+    assert index.search("inconnu") == []
+
+
+def test_refresh_only_reindexes_changed_files(tmp_path):
+    notes = tmp_path / "notes.txt"
+    write(notes, "Acheter du pain")
+    write(tmp_path / "other.txt", "Rien de spécial")
+    index = DocumentIndex([str(tmp_path)])
+    index.refresh()
+    assert index.refresh() == 0
+    write(notes, "Appeler le plombier")
+    assert index.refresh() == 1
+    assert index.search("pain") == []
+    assert index.search("plombier")
+    os.remove(notes)
+    assert index.refresh() == 1
+    assert index.search("plombier") == []
+    assert len(index) == 1
+
+
+def test_build_context_stays_within_the_token_budget(tmp_path):
+    for i in range(5):
+        write(tmp_path / f"doc{i}.txt", f"jardin {i} " + "arrosage " * 60)
+    index = DocumentIndex([str(tmp_path)])
+    context = index.build_context("jardin", token_budget=300)
+    assert 0 < context.count("Contenu du fichier") < 5
+    # No shared term: chunks are taken in file order up to the budget
+    fallback = index.build_context("weather", token_budget=300)
+    assert fallback.startswith("\nContenu du fichier doc0.txt:")
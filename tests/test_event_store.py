@@ -0,0 +1,115 @@
+import json
+import os
+from datetime import date
+
+import pytest
+
+from agents.event_store import EventStore
+
+
+def write_snapshot(path, events, **extra):
+    data = {"birthdays": [], "events": events}
+    data.update(extra)
+    path.write_text(json.dumps(data))
+    # Make sure the store sees a new signature even within the same mtime tick
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def event(name, day):
+    return {"name": name, "date": day, "description": ""}
+
+
+def test_range_queries_are_date_ordered(tmp_path):
+    snapshot = tmp_path / "data.json"
+    write_snapshot(snapshot, [event("b", "2026-03-02"), event("bad", "soon")])
+    store = EventStore(str(snapshot), compact_every=100)
+    store.add(event("a", "2026-03-01"))
+    store.add(event("c", "2026-03-05"))
+    assert [e["name"] for _, e in store.between(date(2026, 3, 1), date(2026, 3, 5))] == ["a", "b"]
+    assert [e["name"] for _, e in store.upcoming(date(2026, 3, 2), limit=5)] == ["b", "c"]
+    assert len(store) == 4
+
+
+def test_journal_survives_restart_and_external_snapshot_edit(tmp_path):
+    snapshot = tmp_path / "data.json"
+    write_snapshot(snapshot, [event("x", "2026-01-01"), event("y", "2026-01-02")])
+    store = EventStore(str(snapshot), compact_every=100)
+    store.add(event("new", "2026-02-01"))
+    # Someone edits the snapshot by hand: the journaled addition must stay
+    write_snapshot(snapshot, [event("x", "2026-01-01"), event("y", "2026-01-02"), event("z", "2026-01-03")])
+    assert [e["name"] for e in store.events()] == ["x", "y", "z", "new"]
+    write_snapshot(snapshot, [event("x", "2026-01-01")])
+    reopened = EventStore(str(snapshot), compact_every=100)
+    assert [e["name"] for e in reopened.events()] == ["x", "new"]
+
+
+def test_crash_between_snapshot_and_journal_truncation_does_not_duplicate(tmp_path, monkeypatch):
+    snapshot = tmp_path / "data.json"
+    write_snapshot(snapshot, [])
+    store = EventStore(str(snapshot), compact_every=100)
+    store.add(event("a", "2026-01-01"))
+    store.add(event("b", "2026-01-02"))
+
+    def crash():
+        raise KeyboardInterrupt
+
+    # Simulate the crash: snapshot written, journal not truncated yet
+    monkeypatch.setattr(store, "_truncate_journal", crash)
+    with pytest.raises(KeyboardInterrupt):
+        store.compact()
+    reopened = EventStore(str(snapshot), compact_every=100)
+    assert [e["name"] for e in reopened.events()] == ["a", "b"]
+    reopened.add(event("c", "2026-01-03"))
+    assert [e["name"] for e in EventStore(str(snapshot)).events()] == ["a", "b", "c"]
+
+
+def test_crash_before_snapshot_replacement_keeps_the_journal(tmp_path, monkeypatch):
+    snapshot = tmp_path / "data.json"
+    write_snapshot(snapshot, [event("x", "2026-01-01")])
+    store = EventStore(str(snapshot), compact_every=100)
+    store.add(event("a", "2026-01-02"))
+
+    def crash(source, destination):
+        raise KeyboardInterrupt
+
+    # The fold record is written, the snapshot is not replaced
+    monkeypatch.setattr(os, "replace", crash)
+    with pytest.raises(KeyboardInterrupt):
+        store.compact()
+    monkeypatch.undo()
+    assert [e["name"] for e in EventStore(str(snapshot)).events()] == ["x", "a"]
+
+
+def test_truncated_journal_record_is_dropped(tmp_path):
+    snapshot = tmp_path / "data.json"
+    write_snapshot(snapshot, [])
+    store = EventStore(str(snapshot), compact_every=100)
+    store.add(event("a", "2026-01-01"))
+    with open(store.journal_path, "a") as file:
+        file.write('{"op": "add", "seq": 2, "ev')
+    reopened = EventStore(str(snapshot), compact_every=100)
+    reopened.add(event("b", "2026-01-02"))
+    assert [e["name"] for e in EventStore(str(snapshot)).events()] == ["a", "b"]
+
+
+def test_compaction_keeps_other_sections(tmp_path):
+    snapshot = tmp_path / "data.json"
+    snapshot.write_text(json.dumps({"birthdays": [{"name": "Sarah"}], "events": []}))
+    store = EventStore(str(snapshot), compact_every=2)
+    store.add(event("a", "2026-01-01"))
+    store.add(event("b", "2026-01-02"))
+    data = json.loads(snapshot.read_text())
+    assert data["birthdays"] == [{"name": "Sarah"}]
+    assert [e["name"] for e in data["events"]] == ["a", "b"]
+    assert os.path.getsize(store.journal_path) == 0
+
+
+def test_compaction_keeps_the_data_file_format(tmp_path):
+    snapshot = tmp_path / "data.json"
+    snapshot.write_text(json.dumps({"birthdays": [], "events": []}))
+    store = EventStore(str(snapshot), compact_every=1)
+    store.add(event("Fête", "2026-01-01"))
+    text = snapshot.read_text()
+    assert "F\\u00eate" in text
+    assert set(json.loads(text)) == {"birthdays", "events"}
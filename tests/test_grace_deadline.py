@@ -0,0 +1,100 @@
+import asyncio
+import importlib.util
+import os
+
+import pytest
+
+for dependency in ("fastapi", "httpx", "openai", "uvicorn"):
+    pytest.importorskip(dependency)
+nest_asyncio = pytest.importorskip("nest_asyncio")
+
+AGENTS_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "familyconnect-agents")
+
+
+@pytest.fixture(scope="module")
+def grace_module():
+    # The agent patches asyncio for the whole process at import; keep that out of the test session
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(nest_asyncio, "apply", lambda *args, **kwargs: None)
+        patch.syspath_prepend(AGENTS_DIRECTORY)
+        spec = importlib.util.spec_from_file_location(
+            "standalone_grace_agent", os.path.join(AGENTS_DIRECTORY, "standalone_grace_agent.py"))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    return module
+
+
+class SlowLLM:
+    """Stand-in for generate_llm_response answering after delay seconds"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = []
+
+    async def __call__(self, messages):
+        self.calls.append(messages)
+        await asyncio.sleep(self.delay)
+        return f"LLM answer to {messages[-1].content}"
+
+
+def make_agent(grace_module, delay, deadline_ms=20):
+    agent = grace_module.GraceAgent()
+    agent.deadline_ms = deadline_ms
+    agent.generate_llm_response = SlowLLM(delay)
+    return agent
+
+
+def test_late_answer_is_given_on_the_same_session_next_turn(grace_module):
+    message = grace_module.ChatMessage
+    agent = make_agent(grace_module, delay=0.1)
+
+    async def conversation():
+        first = [message(role="user", content="hello")]
+        reply = await agent.generate_deadline_response(first, "alice")
+        assert reply == agent.generate_local_response(first)
+        await asyncio.sleep(0.2)
+        assert agent.deadline_stats["late_answers_stored"] == 1
+
+        second = first + [message(role="assistant", content=reply), message(role="user", content="and then?")]
+        # Another client sending the very same history does not get Alice's answer
+        other = await agent.generate_deadline_response(second, "bob")
+        assert not other.startswith("LLM answer to hello")
+        answer = await agent.generate_deadline_response(second, "alice")
+        assert answer.startswith("LLM answer to hello\n\n")
+        # The LLM saw the late answer in place of the local reply it replaced
+        assert agent.generate_llm_response.calls[-1][-2].content == "LLM answer to hello"
+        await asyncio.sleep(0.2)
+
+    asyncio.run(conversation())
+    assert agent.deadline_stats["late_answers_delivered"] == 1
+
+
+def test_without_session_the_late_call_is_cancelled(grace_module):
+    message = grace_module.ChatMessage
+    agent = make_agent(grace_module, delay=0.1)
+
+    async def turn():
+        first = [message(role="user", content="hello")]
+        reply = await agent.generate_deadline_response(first, None)
+        await asyncio.sleep(0.2)
+        return first, reply
+
+    first, reply = asyncio.run(turn())
+    assert reply == agent.generate_local_response(first)
+    assert not agent.late_answers
+    assert not agent.late_tasks
+
+
+def test_answer_finishing_at_the_deadline_is_not_dropped(grace_module, monkeypatch):
+    message = grace_module.ChatMessage
+    agent = make_agent(grace_module, delay=0)
+
+    async def wait_for_then_time_out(awaitable, timeout):
+        # The deadline fires in the same step the LLM call completes
+        await awaitable
+        raise asyncio.TimeoutError
+
+    monkeypatch.setattr(grace_module.asyncio, "wait_for", wait_for_then_time_out)
+    reply = asyncio.run(agent.generate_deadline_response([message(role="user", content="hello")], "alice"))
+    assert reply == "LLM answer to hello"
+    assert agent.deadline_stats["on_time"] == 1
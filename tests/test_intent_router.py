@@ -0,0 +1,57 @@
+import pytest
+
+from agents.intent_router import dispatch, normalize
+
+
+def test_normalize_strips_accents_and_keeps_origin():
+    text, origin = normalize("Météo à Saint-Étienne")
+    assert text == "meteo a saint-etienne"
+    assert len(origin) == len(text)
+
+
+@pytest.mark.parametrize("query", [
+    "Je n'ai pas le temps de cuisiner",
+    "Qu'est-ce qu'il fait mon petit-fils ?",
+    "Il fait ses devoirs avec sa mère",
+])
+def test_everyday_sentences_are_not_weather(query):
+    assert dispatch(query).name == "chat"
+
+
+@pytest.mark.parametrize("query, city", [
+    ("météo de Paris demain", "Paris"),
+    ("il fait à Toulouse combien de degrés", "Toulouse"),
+    ("quel temps fait-il à Bordeaux ?", "Bordeaux"),
+    ("Météo à Saint-Étienne", "Saint-Étienne"),
+    ("météo de la semaine à Nice", "Nice"),
+    ("météo de Paris la semaine prochaine", "Paris"),
+    ("météo pour demain à Lyon, s'il te plaît", "Lyon"),
+    ("il fait froid à Aix-en-Provence ?", "Aix-en-Provence"),
+    ("météo de Le Havre ce week-end", "Le Havre"),
+])
+def test_weather_city_stops_at_dates_and_stopwords(query, city):
+    assert dispatch(query) == ("weather", {"city": city})
+
+
+def test_weather_without_city_has_no_slot():
+    assert dispatch("il fait beau aujourd'hui ?") == ("weather", {})
+
+
+def test_translation_takes_priority_and_keeps_the_sentence():
+    assert dispatch("TRADUIRE il fait beau aujourd'hui") == ("translate", {"sentence": "il fait beau aujourd'hui"})
+
+
+def test_unknown_query_goes_to_chat():
+    assert dispatch(None) == ("chat", {})
+    assert dispatch("raconte-moi une histoire") == ("chat", {})
+
+
+@pytest.mark.parametrize("query, intent", [
+    ("c'est quand l'anniversaire de Sarah ?", "birthdays"),
+    ("Dates d'anniversaires de la famille", "birthdays"),
+    ("quels sont les prochains anniversaires ?", "birthdays"),
+    ("bon anniversaire mamie !", "chat"),
+    ("je prépare un gâteau d'anniversaire", "chat"),
+])
+def test_birthdays_only_for_questions_about_them(query, intent):
+    assert dispatch(query).name == intent
@@ -0,0 +1,74 @@
+import os
+from datetime import datetime, timedelta
+
+from agents import interaction_log
+from agents.interaction_log import InteractionLog, default_spill_path
+
+
+def fill(log, count):
+    for index in range(count):
+        log.append({"index": index})
+
+
+def test_reads_are_bounded_by_capacity(tmp_path):
+    log = InteractionLog(str(tmp_path / "log.jsonl"), capacity=5)
+    fill(log, 12)
+    assert len(log) == 12
+    assert [entry["index"] for entry in log.query()] == list(range(7, 12))
+    assert [entry["index"] for entry in log.page()] == list(range(0, 5))
+    assert [entry["index"] for entry in log.query(offset=3, limit=4)] == [3, 4, 5, 6]
+    assert [entry["index"] for entry in log] == list(range(12))
+    assert log[0]["index"] == 0 and log[-1]["index"] == 11
+
+
+def test_records_are_stamped_at_append_time(tmp_path):
+    log = InteractionLog(str(tmp_path / "log.jsonl"), capacity=2)
+    # Entries built before a slow call carry an old timestamp, but are logged now
+    stale = (datetime.now() - timedelta(hours=1)).isoformat()
+    before = datetime.now()
+    log.append({"name": "late", "timestamp": stale})
+    fill(log, 3)
+    entries = log.between(before, limit=10)
+    assert [entry.get("name", entry.get("index")) for entry in entries] == ["late", 0, 1, 2]
+    assert entries[0]["timestamp"] == stale
+    assert log.between(end=before) == []
+
+
+def test_between_is_limited(tmp_path):
+    log = InteractionLog(str(tmp_path / "log.jsonl"), capacity=3)
+    fill(log, 10)
+    assert [entry["index"] for entry in log.query(start=datetime(2000, 1, 1), offset=2, limit=3)] == [2, 3, 4]
+    assert len(log.between()) == 3
+
+
+def test_partial_last_line_is_dropped_on_reload(tmp_path):
+    path = tmp_path / "log.jsonl"
+    log = InteractionLog(str(path), capacity=1)
+    fill(log, 4)
+    with open(path, "ab") as file:
+        file.write(b'{"ts": 1.0, "da')
+    reloaded = InteractionLog(str(path), capacity=1)
+    assert len(reloaded) == 3
+    reloaded.append({"index": 4})
+    reloaded.append({"index": 5})
+    assert [entry["index"] for entry in reloaded.page(limit=10)] == [0, 1, 2, 4, 5]
+
+
+def test_without_spill_path_old_records_are_dropped():
+    log = InteractionLog(None, capacity=2)
+    fill(log, 5)
+    assert [entry["index"] for entry in log.latest()] == [3, 4]
+
+
+def test_spill_files_of_old_runs_are_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(interaction_log, "LOG_DIRECTORY", str(tmp_path))
+    for run in range(5):
+        path = tmp_path / f"master_conversation-run{run}.jsonl"
+        path.write_text("")
+        os.utime(path, (1000 + run, 1000 + run))
+    (tmp_path / "elderly_responses-run0.jsonl").write_text("")
+    path = default_spill_path("master_conversation", run_id="run9", keep_runs=2)
+    assert path == str(tmp_path / "master_conversation-run9.jsonl")
+    assert sorted(os.listdir(tmp_path)) == ["elderly_responses-run0.jsonl",
+                                            "master_conversation-run3.jsonl",
+                                            "master_conversation-run4.jsonl"]
@@ -0,0 +1,50 @@
+import asyncio
+import sqlite3
+
+from agents import response_cache
+from agents.response_cache import ResponseCache
+
+
+def last_access(path, key):
+    with sqlite3.connect(path) as db:
+        return db.execute("SELECT last_access FROM responses WHERE key = ?", (key,)).fetchone()[0]
+
+
+def test_disk_hits_update_last_access_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(response_cache, "ACCESS_FLUSH_INTERVAL", 3)
+    path = str(tmp_path / "cache.sqlite3")
+    writer = ResponseCache(path)
+    for key in "abc":
+        writer.set(key, key.upper())
+    stored = last_access(path, "a")
+    writer.close()
+
+    cache = ResponseCache(path, max_memory_entries=0)
+    assert cache.get("a") == "A" and cache.get("b") == "B"
+    assert last_access(path, "a") == stored
+    assert cache.get("c") == "C"
+    assert last_access(path, "a") > stored
+    cache.get("a")
+    cache.close()
+    assert cache.stats["disk_hits"] == 4
+
+
+def test_async_access_goes_through_both_tiers(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResponseCache(path, max_memory_entries=1)
+
+    async def scenario():
+        await cache.aset("a", "A")
+        await cache.aset("b", "B")
+        return await cache.aget("b"), await cache.aget("a"), await cache.aget("missing")
+
+    assert asyncio.run(scenario()) == ("B", "A", None)
+    assert cache.stats["memory_hits"] == 1 and cache.stats["disk_hits"] == 1
+    cache.close()
+
+
+def test_memory_only_cache_accepts_any_value():
+    cache = ResponseCache(path=None)
+    value = object()
+    asyncio.run(cache.aset("key", value))
+    assert asyncio.run(cache.aget("key")) is value
@@ -0,0 +1,73 @@
+import threading
+import time
+
+from agents.response_cache import ResponseCache
+from agents.translation_agent import TranslationService
+
+
+class RecordingTranslator:
+    """Fake translator that, like GoogleTranslator, keeps the text being translated on the instance"""
+
+    instances = []
+
+    def __init__(self, source, target):
+        self.target = target
+        self.current = None
+        self.shared_with_other_thread = False
+        self.owner = threading.get_ident()
+        # Every text handed to translate(), in call order
+        self.sent = []
+        RecordingTranslator.instances.append(self)
+
+    def translate(self, text):
+        if threading.get_ident() != self.owner:
+            self.shared_with_other_thread = True
+        self.current = text
+        self.sent.append(text)
+        time.sleep(0.01)
+        return "\n".join(f"{line}-{self.target}" for line in self.current.split("\n"))
+
+
+def make_service():
+    RecordingTranslator.instances = []
+    return TranslationService(RecordingTranslator, cache=ResponseCache(path=None))
+
+
+def test_batch_keeps_order_and_deduplicates():
+    service = make_service()
+    assert service.translate_batch(["a", "b", "a", ""], "en") == ["a-en", "b-en", "a-en", ""]
+    # "a" and "b" were sent together, once, and the empty text not at all
+    assert len(RecordingTranslator.instances) == 1
+    sent_lines = [line for text in RecordingTranslator.instances[0].sent for line in text.split("\n")]
+    assert sorted(sent_lines) == ["a", "b"]
+
+
+def test_translations_are_cached():
+    service = make_service()
+    service.translate_batch(["bonjour"], "en")
+    RecordingTranslator.instances[0].translate = None  # any new call would fail
+    assert service.translate_batch(["bonjour"], "en") == ["bonjour-en"]
+
+
+def test_concurrent_threads_never_share_a_translator():
+    service = make_service()
+    results = {}
+
+    def worker(index):
+        texts = [f"texte {index}"]
+        results[index] = service.translate_batch(texts, "en")
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {index: [f"texte {index}-en"] for index in range(8)}
+    assert not any(translator.shared_with_other_thread for translator in RecordingTranslator.instances)
+
+
+def test_translator_is_reused_within_a_thread():
+    service = make_service()
+    assert service.translator("fr", "en") is service.translator("fr", "en")
+    assert service.translator("fr", "de") is not service.translator("fr", "en")
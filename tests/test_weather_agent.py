@@ -0,0 +1,113 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from agents.base_agent import close_shared_clients
+from agents.weather_agent import WeatherClient
+
+
+class FakeOpenWeather(BaseHTTPRequestHandler):
+    """OpenWeather stand-in: answers after a short delay and counts the requests per city"""
+
+    def do_GET(self):
+        city = parse_qs(urlparse(self.path).query)["q"][0]
+        with self.server.lock:
+            self.server.requests[city] = self.server.requests.get(city, 0) + 1
+        time.sleep(self.server.delay)
+        if city == "Nulle-part":
+            body = {"cod": "404", "message": "city not found"}
+        else:
+            body = {
+                "cod": 200,
+                "dt": 1760000000,
+                "main": {"temp_min": 12.5, "temp_max": 18.0, "humidity": 70},
+                "wind": {"speed": 3.2, "deg": 90},
+                "weather": [{"description": "ciel dégagé"}],
+                "sys": {"sunrise": 1759990000, "sunset": 1760030000},
+            }
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenWeather)
+    httpd.requests = {}
+    httpd.lock = threading.Lock()
+    httpd.delay = 0.1
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_client(server, **options):
+    return WeatherClient(base_url=f"http://127.0.0.1:{server.server_port}/weather", api_key="test", **options)
+
+
+def test_weather_from_the_endpoint_is_formatted_and_cached(server):
+    client = make_client(server)
+    info = client.get_weather("paris")
+    assert info["city"] == "Paris"
+    assert info["description"] == "Ciel dégagé"
+    assert info["wind_speed"] == "3.2 m/s (E)"
+    assert client.get_weather(" Paris ") == info
+    assert server.requests == {"paris": 1}
+
+
+def test_concurrent_lookups_share_one_request(server):
+    client = make_client(server)
+    results = []
+
+    def lookup():
+        results.append(client.get_weather("Lyon"))
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 8 and all(result == results[0] for result in results)
+    assert server.requests == {"Lyon": 1}
+
+
+def test_concurrent_async_lookups_share_one_request(server):
+    client = make_client(server)
+
+    async def lookups():
+        try:
+            return await asyncio.gather(*(client.get_weather_async("Nice") for _ in range(8)))
+        finally:
+            await close_shared_clients()
+
+    results = asyncio.run(lookups())
+    assert all(result == results[0] and "error" not in result for result in results)
+    assert server.requests == {"Nice": 1}
+
+
+def test_errors_are_not_cached(server):
+    client = make_client(server)
+    assert client.get_weather("Nulle-part") == {"error": "city not found"}
+    assert client.get_weather("Nulle-part") == {"error": "city not found"}
+    assert server.requests == {"Nulle-part": 2}
+
+
+def test_unreachable_endpoint_gives_an_error(server):
+    port = server.server_port
+    server.shutdown()
+    server.server_close()
+    client = WeatherClient(base_url=f"http://127.0.0.1:{port}/weather", api_key="test", timeout=1)
+    assert "error" in client.get_weather("Paris")